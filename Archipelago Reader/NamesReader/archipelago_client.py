@@ -1,48 +1,194 @@
 import asyncio
+import random
 import websockets
 import json
 import uuid
-from config_manager import load_config, runtime_config
-from message_processor import MessageProcessor
+from config_manager import load_config, runtime_config, get_data_path
+from message_processor import MessageProcessor, split_lanes, receive_time
+from data_package_cache import DataPackageCache
 from data_package_manager import DataPackageManager
+from broadcast_server import BroadcastServer
+from transport import KeepaliveWatchdog, MeteredWebSocket, TransportStats, get_connect_options
+
+# Tags and items handling sent in Connect for each connection profile
+CONNECTION_PROFILES = {
+    # Full game client, server pushes ReceivedItems and other item traffic
+    "game": {"tags": ["AP"], "items_handling": 7},
+    # Read-only chat client, no item traffic
+    "text": {"tags": ["AP", "TextOnly"], "items_handling": 0},
+    # Tracker client, no item traffic
+    "tracker": {"tags": ["Tracker"], "items_handling": 0}
+}
 
 class ArchipelagoClient:
-    def __init__(self, target_players, gui=None):
+    def __init__(self, target_players, gui=None, data_package_manager=None):
         self.target_players = target_players
         self.gui = gui
-        self.data_package_manager = DataPackageManager()
-        self.message_processor = MessageProcessor(target_players, self.data_package_manager, gui)
+        config = runtime_config if runtime_config else load_config()
+        # Reuse mappings from previous client if available
+        self.data_package_manager = data_package_manager or DataPackageManager(
+            DataPackageCache(get_data_path("datapackage_cache")),
+            config["NAME_TABLE_BUDGET_MB"] * 1048576
+        )
+        self.message_processor = MessageProcessor(target_players, self.data_package_manager, gui,
+                                                  config["ITEM_CLASSES"], config["ROUTING_RULES"])
         self.websocket = None
         self.connected = False
-    
+        self.should_reconnect = True
+        self.stop_event = None
+        self.stats = TransportStats()  # Traffic of current session
+        self.feed_lane = None  # (PrintJSON batch, receive time) waiting for feed worker
+        self.feed_chunk_size = 100  # Messages resolved between checks for control messages
+        self.broadcast_server = None
+
     async def connect(self):
-        """Establishes connection with Archipelago server"""
+        """Establishes connection with Archipelago server and reconnects when it drops"""
+        self.should_reconnect = True
+        self.stop_event = asyncio.Event()
+
+        await self.start_broadcast_server()
         try:
+            await self.connect_with_retries()
+        finally:
+            if self.broadcast_server:
+                await self.broadcast_server.stop()
+
+    async def start_broadcast_server(self):
+        """Starts local broadcast server if enabled, it survives reconnects"""
+        config = runtime_config if runtime_config else load_config()
+        if not config["BROADCAST_ENABLED"]:
+            return
+
+        self.broadcast_server = BroadcastServer(
+            config["BROADCAST_HOST"],
+            config["BROADCAST_PORT"],
+            config["BROADCAST_QUEUE_SIZE"]
+        )
+        if await self.broadcast_server.start():
+            self.message_processor.broadcaster = self.broadcast_server
+        else:
+            self.broadcast_server = None
+
+    async def connect_with_retries(self):
+        """Runs connection sessions until user disconnects or retries run out"""
+        has_connected = False
+        attempt = 0
+
+        while True:
             # Load current config - use runtime if available
             config = runtime_config if runtime_config else load_config()
-            
-            self.websocket = await websockets.connect(config["SERVER_URI"], max_size=config["MAX_MESSAGE_SIZE"])
+
+            session_opened = await self.run_session(config)
+            has_connected = has_connected or session_opened
+
+            # Don't retry if user disconnected or we never managed to connect
+            if not self.should_reconnect or not config["AUTO_RECONNECT"] or not has_connected:
+                break
+
+            # Start backoff from scratch only after server accepted us, handshake alone isn't a working session
+            attempt = 1 if self.message_processor.authenticated else attempt + 1
+            max_attempts = config["RECONNECT_MAX_ATTEMPTS"]
+            if max_attempts and attempt > max_attempts:
+                print(f"❌ Giving up after {max_attempts} reconnect attempts")
+                if self.gui:
+                    self.gui.update_connection_status("Disconnected", False)
+                break
+
+            delay = self.get_reconnect_delay(attempt, config)
+            print(f"🔄 Reconnecting in {delay:.1f}s (attempt {attempt})")
+            if self.gui:
+                self.gui.update_connection_status(f"Reconnecting in {delay:.0f}s...", False, retrying=True)
+
+            try:
+                # Wait for delay, but wake up immediately if user disconnects
+                await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+    def get_reconnect_delay(self, attempt, config):
+        """Returns jittered exponential backoff delay for given attempt"""
+        cap = min(config["RECONNECT_MAX_DELAY"], config["RECONNECT_BASE_DELAY"] * 2 ** (attempt - 1))
+        # Equal jitter: keep half of delay, randomize the other half
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def run_session(self, config):
+        """Runs single connection session, returns True if connection was opened"""
+        self.message_processor.authenticated = False
+        try:
+            websocket = await websockets.connect(config["SERVER_URI"], **get_connect_options(config))
+            self.stats.reset()
+            self.websocket = MeteredWebSocket(websocket, self.stats)
+        except Exception as e:
+            error_msg = f"❌ Connection error: {e}"
+            print(error_msg)
+            if self.gui:
+                self.gui.update_connection_status("Connection Failed", False)
+            return False
+
+        try:
             print(f"✅ Connected to Archipelago: {config['SERVER_URI']}")
-            
+
             if self.gui:
                 self.gui.update_connection_status("Connected", True)
-            
+
             self.connected = True
             print(f"🔍 Filtering messages for players: {', '.join(self.target_players) if self.target_players else 'ALL PLAYERS'}")
+
+            # Requests from previous connection will never be answered
+            self.data_package_manager.reset_pending()
+
+            # Feed is processed separately so control messages never wait behind it
+            self.feed_lane = asyncio.Queue()
+            feed_worker = asyncio.create_task(self.process_feed_lane())
             
             # Authenticate with current settings
-            if await self.authenticate(self.websocket, config):
-                # Listen for server messages
-                await self.listen(self.websocket)
-                
+            try:
+                if await self.authenticate(self.websocket, config):
+                    # Listen for server messages
+                    if config["WATCHDOG_ENABLED"]:
+                        await self.listen_with_watchdog(self.websocket, config)
+                    else:
+                        await self.listen(self.websocket)
+            finally:
+                feed_worker.cancel()
+                # Worker finishes batch it already took, later batches must wait for it
+                try:
+                    await feed_worker
+                except asyncio.CancelledError:
+                    pass
+                # Show what already arrived before connection ended
+                while not self.feed_lane.empty():
+                    self.message_processor.process_feed(*self.feed_lane.get_nowait())
+
         except Exception as e:
             error_msg = f"❌ Connection error: {e}"
             print(error_msg)
             if self.gui:
                 self.gui.update_connection_status("Connection Failed", False)
+        finally:
+            self.connected = False
+            print(f"📊 Session traffic: {self.stats.summary()} (profile: {config['CONNECTION_PROFILE']})")
+            print(f"🗂 Name tables: {self.data_package_manager.get_table_stats()}")
+
+        return True
+
+    def restore_tables(self, players, slot_games):
+        """Uses players and games from previous session until server sends current ones"""
+        self.message_processor.restore_tables(players, slot_games)
+    
+    def get_tables(self):
+        """Returns copies of players and slot games tables"""
+        return dict(self.message_processor.players), dict(self.message_processor.slot_games)
+    
+    def get_data_package_refs(self):
+        return self.data_package_manager.get_references()
     
     async def close(self):
         """Closes connection with server"""
+        self.should_reconnect = False
+        if self.stop_event:
+            self.stop_event.set()
         if self.websocket:
             await self.websocket.close()
             self.connected = False
@@ -50,11 +196,14 @@ class ArchipelagoClient:
     
     async def authenticate(self, websocket, config):
         """Authenticates with server using current settings"""
+        profile_name = config["CONNECTION_PROFILE"]
+        profile = CONNECTION_PROFILES.get(profile_name, CONNECTION_PROFILES["game"])
         connect_message = [
             {
                 "cmd": "Connect",
                 "password": config["PASSWORD"],
-                "game": config["GAME"],
+                # Text only and tracker clients don't have to match slot's game
+                "game": config["GAME"] if profile_name == "game" else "",
                 "name": config["PLAYER_NAME"],
                 "version": {
                     "major": 0,
@@ -62,43 +211,42 @@ class ArchipelagoClient:
                     "build": 3,
                     "class": "Version"
                 },
-                "tags": ["AP"],
-                "items_handling": 7,
+                "tags": profile["tags"],
+                "items_handling": profile["items_handling"],
                 "uuid": str(uuid.uuid4())
             }
         ]
         
         await websocket.send(json.dumps(connect_message))
-        print("✅ Connection message sent")
+        print(f"✅ Connection message sent (profile: {profile_name})")
         return True
     
     async def listen(self, websocket):
         """Listens for server messages"""
-        data_package_requested = False
-        
         try:
             async for message in websocket:
                 try:
+                    received = receive_time()
                     messages = json.loads(message)
                     
                     if not isinstance(messages, list):
                         messages = [messages]
                     
-                    for msg in messages:
-                        # Process message
-                        request_data_package, close_connection = await self.message_processor.process_message(msg, websocket)
-                        
-                        # If connection needs to be closed
-                        if close_connection:
-                            await self.close()
-                            return
-                        
-                        # If data package needs to be requested
-                        if request_data_package and not data_package_requested:
-                            data_package_requested = True
-                            # Request full data package
-                            await self.data_package_manager.request_data_package(websocket)
-                            
+                    # Control messages are handled right away, feed goes to its own lane
+                    control, feed = split_lanes(messages)
+                    request_data_package, close_connection = await self.message_processor.process_control(control, websocket)
+                    if feed:
+                        self.feed_lane.put_nowait((feed, received))
+                    
+                    # If connection needs to be closed
+                    if close_connection:
+                        await self.close()
+                        return
+                    
+                    # If data package needs to be requested
+                    if request_data_package:
+                        await self.request_outdated_games(websocket)
+
                 except json.JSONDecodeError:
                     # Check if message contains target players
                     if (not self.target_players or any(player in message for player in self.target_players)) and \
@@ -111,4 +259,47 @@ class ArchipelagoClient:
         except websockets.exceptions.ConnectionClosed:
             print("❌ Connection closed by server")
             if self.gui:
-                self.gui.update_connection_status("Disconnected", False)
\ No newline at end of file
+                self.gui.update_connection_status("Disconnected", False)
+    
+    async def process_feed_lane(self):
+        """Resolves PrintJSON batches in chunks, letting listener handle control messages in between"""
+        while True:
+            feed, received = await self.feed_lane.get()
+            for start in range(0, len(feed), self.feed_chunk_size):
+                self.message_processor.process_feed(feed[start:start + self.feed_chunk_size], received)
+                try:
+                    await asyncio.sleep(0)
+                except asyncio.CancelledError:
+                    # Session is ending, finish batch that was already taken from lane
+                    self.message_processor.process_feed(feed[start + self.feed_chunk_size:], received)
+                    raise
+    
+    async def listen_with_watchdog(self, websocket, config):
+        """Listens for server messages and drops connection once it stops responding"""
+        watchdog = asyncio.create_task(KeepaliveWatchdog(websocket, self.stats, config).run())
+        listener = asyncio.create_task(self.listen(websocket))
+        try:
+            await asyncio.wait([watchdog, listener], return_when=asyncio.FIRST_COMPLETED)
+            if watchdog.done() and watchdog.result():
+                reason = watchdog.result()
+                print(f"❌ Connection lost: {reason}")
+                if self.gui:
+                    self.gui.update_connection_status("Connection Lost", False, retrying=True)
+                # Closing handshake would hang on dead connection, drop it right away
+                websocket.transport.abort()
+            await listener
+        finally:
+            watchdog.cancel()
+            listener.cancel()
+    
+    async def request_outdated_games(self, websocket):
+        """Requests only games that are missing or changed since last download"""
+        games = self.data_package_manager.get_outdated_games()
+        if games is None:
+            # Server didn't send checksums, request full data package
+            await self.data_package_manager.request_data_package(websocket)
+        elif games:
+            print(f"📦 Requesting data package for games: {games}")
+            await self.data_package_manager.request_data_package(websocket, games)
+        else:
+            print("✅ Data package is up to date, skipping download")
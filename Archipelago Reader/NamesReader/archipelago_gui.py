@@ -1,11 +1,20 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, Frame, Label, Button, Entry, PanedWindow
-import threading
 import queue
-import asyncio
 import time
 import re
-from config_manager import load_config, save_config, get_default_config
+from collections import deque
+from autoscroll import AutoScroll
+from burst_coalescer import BurstCoalescer
+from config_manager import load_config, save_config, get_default_config, get_data_path
+from data_package_cache import DataPackageCache
+from data_package_manager import DataPackageManager
+from history_archive import HistoryArchive
+from message_processor import PANE_FLAGS
+from overload_guard import OverloadGuard
+from player_tabs import PlayerTabs
+from session_snapshot import SessionSnapshot, save_snapshot
+from text_tags import DEFAULT_MESSAGE_COLORS, TaggedInsert, configure_tags
 
 class ArchipelagoGUI:
     def __init__(self, root):
@@ -27,24 +36,68 @@ class ArchipelagoGUI:
         self.font_size = config["FONT_SIZE"]
         self.font_family = config["FONT_FAMILY"]
         self.max_messages = config["MAX_MESSAGES"]
+        self.colored_messages = config["COLORED_MESSAGES"]
+        self.message_colors = {**DEFAULT_MESSAGE_COLORS, **config["MESSAGE_COLORS"]}
         
         # Apply colors to main window
         self.root.configure(bg=self.bg_color)
         
-        # Queue for messages from other threads
-        self.message_queue = queue.Queue()
+        # Control lane: connection status from client thread, always handled before feed
+        self.control_queue = queue.Queue()
         self.client = None
         self.thread = None
         self.loop = None
+        self.client_in_process = False  # Client runs in child process (CLIENT_PROCESS)
         self.connected = False
         
         # Message buffers and update control
-        self.incoming_buffer = []
-        self.outgoing_buffer = []
+        self.message_buffer = []  # (message, pane flags, event), stored once for all sections
         self.last_update_time = 0
         self.update_interval = 0.1  # Update GUI every 100ms (10 times per second)
         
+        # Collapse release/collect floods into summary lines
+        self.burst_coalescing = config["BURST_COALESCING"]
+        self.incoming_coalescer = BurstCoalescer(config["BURST_THRESHOLD"], config["BURST_WINDOW"])
+        self.outgoing_coalescer = BurstCoalescer(config["BURST_THRESHOLD"], config["BURST_WINDOW"])
+        self.burst_details = {}  # Summary tag -> collapsed lines, until expanded
+        self.max_burst_details = 200
+        
+        # Hide low priority messages while GUI can't keep up
+        self.overload_guard = OverloadGuard(
+            config["OVERLOAD_BACKLOG"],
+            config["OVERLOAD_FLUSH_TIME"],
+            config["OVERLOAD_SAMPLE_RATE"],
+            config["OVERLOAD_COOLDOWN"]
+        )
+        self.last_flush_time = 0  # Seconds spent in previous flush, checked by overload guard
+        self.burst_counter = 0
+        
+        # Mappings survive reconnects and are cached on disk between sessions
+        self.data_package_manager = DataPackageManager(
+            DataPackageCache(get_data_path("datapackage_cache")),
+            config["NAME_TABLE_BUDGET_MB"] * 1048576
+        )
+        
+        # Last messages of each section, saved on exit
+        self.session_snapshot = config["SESSION_SNAPSHOT"]
+        self.incoming_history = deque(maxlen=config["SNAPSHOT_MESSAGES"])
+        self.outgoing_history = deque(maxlen=config["SNAPSHOT_MESSAGES"])
+        self.snapshot = None
+        
+        # Whole session history, older messages compressed in blocks
+        self.history_archive = None
+        if config["HISTORY_ARCHIVE"]:
+            self.history_archive = HistoryArchive(config["HISTORY_BLOCK_SIZE"], config["HISTORY_ARCHIVE_MB"] * 1048576)
+        self.history_view = None
+        
+        # One tab per player instead of shared sections
+        self.player_tabs_enabled = config["PLAYER_TABS"]
+        self.player_tab_messages = config["PLAYER_TAB_MESSAGES"]
+        self.player_tabs = None
+        
         self.setup_ui()
+        self.restore_session()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.start_queue_processing()
     
     def setup_ui(self):
@@ -100,6 +153,61 @@ class ArchipelagoGUI:
         )
         settings_btn.pack(side=tk.RIGHT)
         
+        # History browser, only when history is kept
+        if self.history_archive is not None:
+            history_btn = Button(
+                connection_frame, 
+                text="History", 
+                command=self.open_history,
+                bg=self.widget_bg,
+                fg=self.text_color,
+                font=(self.font_family, self.font_size),
+                relief=tk.FLAT,
+                bd=0,
+                padx=10,
+                pady=5
+            )
+            history_btn.pack(side=tk.RIGHT, padx=(0, 10))
+            
+            # Jump to time, opens history at first message received then
+            jump_btn = Button(
+                connection_frame, 
+                text="Jump", 
+                command=self.jump_to_time,
+                bg=self.widget_bg,
+                fg=self.text_color,
+                font=(self.font_family, self.font_size),
+                relief=tk.FLAT,
+                bd=0,
+                padx=10,
+                pady=5
+            )
+            jump_btn.pack(side=tk.RIGHT, padx=(0, 10))
+            self.jump_var = tk.StringVar()
+            jump_entry = Entry(
+                connection_frame, 
+                textvariable=self.jump_var, 
+                width=8,
+                bg=self.entry_bg,
+                fg=self.text_color,
+                font=(self.font_family, self.font_size),
+                insertbackground=self.text_color,
+                relief=tk.FLAT,
+                bd=1
+            )
+            jump_entry.pack(side=tk.RIGHT, padx=(0, 5))
+            jump_entry.bind("<Return>", lambda e: self.jump_to_time())
+        
+        # Traffic counters of current session
+        self.traffic_label = Label(
+            connection_frame, 
+            text="",
+            bg=self.bg_color,
+            fg=self.text_color,
+            font=(self.font_family, max(self.font_size - 2, 6))
+        )
+        self.traffic_label.pack(side=tk.RIGHT, padx=(0, 10))
+        
         # PanedWindow for resizable top/bottom sections
         paned_window = PanedWindow(
             main_frame, 
@@ -110,6 +218,19 @@ class ArchipelagoGUI:
             sashrelief=tk.FLAT
         )
         paned_window.pack(fill=tk.BOTH, expand=True)
+        self.paned_window = paned_window
+        
+        # Overload banner, shown only when messages were hidden
+        self.overload_banner = Label(
+            main_frame, 
+            text="",
+            bg=self.header_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            pady=5,
+            cursor="hand2"
+        )
+        self.overload_banner.bind("<Button-1>", lambda e: self.overload_guard.dismiss())
         
         # Incoming messages frame
         incoming_frame = Frame(paned_window, bg=self.bg_color, bd=1, relief=tk.SOLID)
@@ -173,9 +294,100 @@ class ArchipelagoGUI:
         )
         self.outgoing_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # Burst summaries expand on click
+        for text_widget in (self.incoming_text, self.outgoing_text):
+            text_widget.tag_configure("burst", underline=True)
+            text_widget.tag_bind("burst", "<Button-1>", lambda e, w=text_widget: self.expand_burst(w, e))
+            text_widget.tag_bind("burst", "<Enter>", lambda e, w=text_widget: w.configure(cursor="hand2"))
+            text_widget.tag_bind("burst", "<Leave>", lambda e, w=text_widget: w.configure(cursor=""))
+            configure_tags(text_widget, self.message_colors)
+        
+        # New messages indicators, shown while section is scrolled up
+        self.incoming_indicator = Label(
+            incoming_frame, 
+            text="",
+            bg=self.header_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            pady=2,
+            cursor="hand2"
+        )
+        self.outgoing_indicator = Label(
+            outgoing_frame, 
+            text="",
+            bg=self.header_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            pady=2,
+            cursor="hand2"
+        )
+        self.incoming_scroll = AutoScroll(self.incoming_text, self.incoming_indicator, self.max_messages)
+        self.outgoing_scroll = AutoScroll(self.outgoing_text, self.outgoing_indicator, self.max_messages)
+        
         # Set initial sash position to the middle
         paned_window.paneconfig(incoming_frame, height=300)
         paned_window.paneconfig(outgoing_frame, height=300)
+        self.content_frame = paned_window
+        
+        # Per-player tabs take place of both sections
+        if self.player_tabs_enabled:
+            self.player_tabs = PlayerTabs(
+                main_frame,
+                self.create_tab_view,
+                self.player_tab_messages,
+                self.max_messages,
+                self.colored_messages,
+                self.bg_color,
+                self.text_color,
+                (self.font_family, self.font_size)
+            )
+            paned_window.pack_forget()
+            self.player_tabs.frame.pack(fill=tk.BOTH, expand=True)
+            self.content_frame = self.player_tabs.frame
+    
+    def create_tab_view(self, parent):
+        """Creates text widget for player tab, styled like main sections"""
+        view = tk.Text(
+            parent,
+            wrap=tk.WORD,
+            state=tk.DISABLED,
+            bg=self.bg_color,
+            fg=self.text_color,
+            insertbackground=self.text_color,
+            selectbackground="#3D4F5D",
+            font=(self.font_family, self.font_size),
+            relief=tk.FLAT,
+            highlightthickness=0,
+            bd=0
+        )
+        configure_tags(view, self.message_colors)
+        return view
+    
+    def open_history(self):
+        """Opens history window or brings existing one to front, returns it"""
+        if self.history_view and self.history_view.exists():
+            self.history_view.lift()
+            return self.history_view
+        from history_view import HistoryView
+        self.history_view = HistoryView(
+            self.root,
+            self.history_archive,
+            self.bg_color,
+            self.text_color,
+            self.widget_bg,
+            (self.font_family, self.font_size)
+        )
+        return self.history_view
+    
+    def jump_to_time(self):
+        """Shows history from time in jump field, HH:MM or YYYY-MM-DD HH:MM"""
+        from history_view import parse_time
+        try:
+            when = parse_time(self.jump_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.open_history().show_time(when)
     
     def toggle_connection(self):
         if not self.connected:
@@ -186,16 +398,35 @@ class ArchipelagoGUI:
     def connect(self):
         """Establishes connection with server"""
         try:
+            # Imported here, network stack isn't needed until first connect
+            import asyncio
+            import threading
             from archipelago_client import ArchipelagoClient
             from main import run_asyncio_loop
             
             # Update settings from config
             config = load_config()
             
-            self.client = ArchipelagoClient(config["TARGET_PLAYERS"], self)
-            self.loop = asyncio.new_event_loop()
-            self.thread = threading.Thread(target=run_asyncio_loop, args=(self.client, self.loop), daemon=True)
-            self.thread.start()
+            self.client_in_process = config["CLIENT_PROCESS"]
+            if self.client_in_process:
+                # Network and processing run in child process, it streams resolved records back
+                from client_process import ClientProcess
+                self.client = ClientProcess(config["TARGET_PLAYERS"])
+            else:
+                # Keep already downloaded mappings warm between connections
+                self.client = ArchipelagoClient(config["TARGET_PLAYERS"], self, self.data_package_manager)
+            if self.snapshot:
+                # Previous session tables are used until server sends current ones
+                self.client.restore_tables(self.snapshot.players, self.snapshot.slot_games)
+                self.snapshot = None
+            
+            if self.client_in_process:
+                self.loop = None
+                self.client.start()
+            else:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=run_asyncio_loop, args=(self.client, self.loop), daemon=True)
+                self.thread.start()
             
             self.connect_btn.config(text="Connecting...", state=tk.DISABLED)
             self.status_label.config(text="Connecting...")
@@ -206,9 +437,60 @@ class ArchipelagoGUI:
             self.status_label.config(text="Connection Failed")
             self.connect_btn.config(text="Connect", state=tk.NORMAL)
     
+    def restore_session(self):
+        """Shows messages of previous session before connecting"""
+        if not self.session_snapshot:
+            return
+        self.snapshot = SessionSnapshot.load(get_data_path("session.bin"))
+        if self.snapshot is None:
+            return
+        
+        # Game data is read from disk cache only once a name is needed
+        self.data_package_manager.restore_cached_games(self.snapshot.data_package_refs)
+        
+        for text_widget, history, pane in ((self.incoming_text, self.incoming_history, "incoming"),
+                                           (self.outgoing_text, self.outgoing_history, "outgoing")):
+            messages = self.snapshot.get_messages(pane)
+            if not messages:
+                continue
+            history.extend(messages)
+            text_widget.configure(state=tk.NORMAL)
+            text_widget.insert(tk.END, "".join(message + "\n" for message in messages[-self.max_messages:]))
+            text_widget.see(tk.END)
+            text_widget.configure(state=tk.DISABLED)
+    
+    def save_session(self):
+        """Saves players, games and last messages for next start"""
+        if not self.session_snapshot:
+            return
+        if self.client:
+            players, slot_games = self.client.get_tables()
+        elif self.snapshot:
+            # Never connected, keep previous session tables
+            players, slot_games = self.snapshot.players, self.snapshot.slot_games
+        else:
+            players, slot_games = {}, {}
+        
+        save_snapshot(
+            get_data_path("session.bin"),
+            players,
+            slot_games,
+            {"incoming": list(self.incoming_history), "outgoing": list(self.outgoing_history)},
+            self.client.get_data_package_refs() if self.client else self.data_package_manager.get_references()
+        )
+    
+    def on_close(self):
+        self.save_session()
+        if self.client_in_process and self.client:
+            self.client.close()
+        self.root.destroy()
+    
     def disconnect(self):
         """Disconnects from server"""
-        if self.client and self.loop:
+        if self.client and self.client_in_process:
+            self.client.close()
+        elif self.client and self.loop:
+            import asyncio
             # Stop client
             asyncio.run_coroutine_threadsafe(self.client.close(), self.loop)
             
@@ -216,10 +498,27 @@ class ArchipelagoGUI:
         self.connect_btn.config(text="Connect", state=tk.NORMAL)
         self.status_label.config(text="Disconnected")
     
-    def update_connection_status(self, status, success=True):
+    def update_connection_status(self, status, success=True, retrying=False):
+        """Queues connection status, called from client thread"""
+        self.control_queue.put((status, success, retrying))
+    
+    def process_control_events(self):
+        """Applies every queued connection status, newest one stays on screen"""
+        while True:
+            try:
+                status, success, retrying = self.control_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.apply_connection_status(status, success, retrying)
+    
+    def apply_connection_status(self, status, success=True, retrying=False):
         """Updates connection status"""
-        self.connected = success
-        if success:
+        # While client is retrying, button stays as Disconnect to allow cancelling
+        self.connected = success or retrying
+        if retrying:
+            self.connect_btn.config(text="Disconnect", state=tk.NORMAL)
+            self.status_label.config(text=status)
+        elif success:
             self.connect_btn.config(text="Disconnect", state=tk.NORMAL)
             self.status_label.config(text="Connected")
         else:
@@ -710,9 +1009,89 @@ class ArchipelagoGUI:
         )
         widget_bg_color_entry.grid(row=10, column=1, sticky='ew', pady=(0, 5), padx=(5, 0))
 
+        # Connection profile setting with new layout
+        label_reset_frame = Frame(scrollable_frame, bg=self.bg_color)
+        label_reset_frame.grid(row=11, column=0, sticky='w', pady=(0, 5))
+
+        reset_btn = Button(
+            label_reset_frame,
+            text="↺",
+            command=lambda: connection_profile_var.set(default_config["CONNECTION_PROFILE"]),
+            bg=self.widget_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            relief=tk.FLAT,
+            bd=0,
+            padx=3,
+            pady=1,
+            width=2
+        )
+        reset_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        Label(
+            label_reset_frame, 
+            text="Connection profile (game, text, tracker):",
+            bg=self.bg_color,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size)
+        ).pack(side=tk.LEFT)
+
+        connection_profile_var = tk.StringVar(value=config["CONNECTION_PROFILE"])
+        connection_profile_entry = Entry(
+            scrollable_frame, 
+            textvariable=connection_profile_var, 
+            bg=self.entry_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            insertbackground=self.text_color,
+            relief=tk.FLAT,
+            bd=1
+        )
+        connection_profile_entry.grid(row=11, column=1, sticky='ew', pady=(0, 5), padx=(5, 0))
+
+        # Item classes setting with new layout
+        label_reset_frame = Frame(scrollable_frame, bg=self.bg_color)
+        label_reset_frame.grid(row=12, column=0, sticky='w', pady=(0, 5))
+
+        reset_btn = Button(
+            label_reset_frame,
+            text="↺",
+            command=lambda: item_classes_var.set(", ".join(default_config["ITEM_CLASSES"])),
+            bg=self.widget_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            relief=tk.FLAT,
+            bd=0,
+            padx=3,
+            pady=1,
+            width=2
+        )
+        reset_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        Label(
+            label_reset_frame, 
+            text="Item classes (progression, useful, trap, filler):",
+            bg=self.bg_color,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size)
+        ).pack(side=tk.LEFT)
+
+        item_classes_var = tk.StringVar(value=", ".join(config["ITEM_CLASSES"]))
+        item_classes_entry = Entry(
+            scrollable_frame, 
+            textvariable=item_classes_var, 
+            bg=self.entry_bg,
+            fg=self.text_color,
+            font=(self.font_family, self.font_size),
+            insertbackground=self.text_color,
+            relief=tk.FLAT,
+            bd=1
+        )
+        item_classes_entry.grid(row=12, column=1, sticky='ew', pady=(0, 5), padx=(5, 0))
+
         # Button frame at the bottom
         button_frame = Frame(scrollable_frame, bg=self.bg_color)
-        button_frame.grid(row=11, column=0, columnspan=2, pady=(20, 0))
+        button_frame.grid(row=13, column=0, columnspan=2, pady=(20, 0))
 
         # Save button
         save_btn = Button(
@@ -730,6 +1109,8 @@ class ArchipelagoGUI:
                 bg_color_var.get(),
                 text_color_var.get(),
                 widget_bg_color_var.get(),
+                connection_profile_var.get(),
+                item_classes_var.get(),
                 settings_window
             ),
             bg=self.widget_bg,
@@ -766,7 +1147,7 @@ class ArchipelagoGUI:
         
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
     
-    def save_settings(self, server_uri, player_name, password, game, target_players, max_messages, font_size, font_family, bg_color, text_color, widget_bg_color, settings_window):
+    def save_settings(self, server_uri, player_name, password, game, target_players, max_messages, font_size, font_family, bg_color, text_color, widget_bg_color, connection_profile, item_classes, settings_window):
         """Saves settings to config.py and applies them immediately"""
         try:
             # Validate required fields
@@ -777,8 +1158,22 @@ class ArchipelagoGUI:
             if not game.strip():
                 raise ValueError("Game cannot be empty")
             
+            from archipelago_client import CONNECTION_PROFILES
+            from message_processor import ITEM_CLASS_FLAGS, compile_player_patterns
+            
+            connection_profile = connection_profile.strip().lower()
+            if connection_profile not in CONNECTION_PROFILES:
+                raise ValueError(f"Connection profile must be one of: {', '.join(CONNECTION_PROFILES)}")
+            
             # Process target players (can be empty)
             target_players_list = [p.strip() for p in target_players.split(",") if p.strip()]
+            compile_player_patterns(target_players_list)
+            
+            # Process item classes (empty shows everything)
+            item_classes_list = [c.strip().lower() for c in item_classes.split(",") if c.strip()]
+            for item_class in item_classes_list:
+                if item_class not in ITEM_CLASS_FLAGS:
+                    raise ValueError(f"Item class must be one of: {', '.join(ITEM_CLASS_FLAGS)}")
             
             # Validate numeric values
             try:
@@ -804,8 +1199,9 @@ class ArchipelagoGUI:
             if not re.match(color_regex, widget_bg_color):
                 raise ValueError("Widget background color must be in #RRGGBB format")
             
-            # Create new config dictionary
-            new_config = {
+            # Create new config dictionary, keeping settings not shown in this window
+            new_config = load_config().copy()
+            new_config.update({
                 "SERVER_URI": server_uri,
                 "PLAYER_NAME": player_name,
                 "PASSWORD": password,
@@ -817,8 +1213,10 @@ class ArchipelagoGUI:
                 "FONT_FAMILY": font_family,
                 "BG_COLOR": bg_color,
                 "TEXT_COLOR": text_color,
-                "WIDGET_BG_COLOR": widget_bg_color
-            }
+                "WIDGET_BG_COLOR": widget_bg_color,
+                "CONNECTION_PROFILE": connection_profile,
+                "ITEM_CLASSES": item_classes_list
+            })
             
             # Save using config_manager
             save_config(new_config)
@@ -869,69 +1267,169 @@ class ArchipelagoGUI:
             fg=self.text_color,
             font=(self.font_family, self.font_size)
         )
+        
+        for indicator in (self.incoming_indicator, self.outgoing_indicator):
+            indicator.configure(fg=self.text_color, font=(self.font_family, self.font_size))
+        self.incoming_scroll.set_max_lines(self.max_messages)
+        self.outgoing_scroll.set_max_lines(self.max_messages)
+        
+        if self.player_tabs:
+            self.player_tabs.max_messages = self.max_messages
+            self.player_tabs.configure_views(
+                bg=self.bg_color,
+                fg=self.text_color,
+                font=(self.font_family, self.font_size)
+            )
     
-    def add_message(self, message, message_type):
-        """Adds message to appropriate buffer"""
-        # Filter only messages starting with 📢
-        if message.startswith("📢"):
-            if message_type == "incoming":
-                self.incoming_buffer.append(message)
-            elif message_type == "outgoing":
-                self.outgoing_buffer.append(message)
+    def add_records(self, records):
+        """Adds (message, pane flags, event) records of one frame, pane flags tell which sections show it"""
+        # Filter only messages starting with 📢, shedding is decided on GUI thread
+        # Single extend, GUI thread sees whole frame at once
+        self.message_buffer.extend([record for record in records if record[0].startswith("📢")])
+    
+    def expand_burst(self, text_widget, event):
+        """Replaces burst summary marker with collapsed messages"""
+        index = text_widget.index(f"@{event.x},{event.y}")
+        for tag in text_widget.tag_names(index):
+            lines = self.burst_details.pop(tag, None)
+            if lines is None:
+                continue
+            
+            start, end = text_widget.tag_ranges(tag)
+            text_widget.configure(state=tk.NORMAL)
+            text_widget.tag_remove("burst", start, end)
+            text_widget.insert(end, "".join("\n    " + line for line in lines), ())
+            text_widget.configure(state=tk.DISABLED)
+            text_widget.tag_delete(tag)
+            break
+    
+    def flush_buffer(self, text_widget, records, pane_flag, coalescer, history, scroll, now):
+        """Inserts buffered messages of one section into text widget, holds them back while section is scrolled up"""
+        # Collapse bursts before anything touches the widget
+        lines = []
+        for message, pane_flags, event in records:
+            if not pane_flags & pane_flag:
+                continue
+            if self.burst_coalescing:
+                lines.extend((line, details, event) for line, details in coalescer.add(message, event, now))
+            else:
+                lines.append((message, None, event))
+        lines.extend((line, details, None) for line, details in coalescer.flush(now))
+        for line, details, event in lines:
+            history.append(line)
+        
+        # User reads older messages, leave widget alone until they scroll back down
+        if scroll.hold(lines):
+            return
+        lines = scroll.take(lines)
+        if not lines:
+            return
+        
+        # All buffered messages go in with one insert, colors use tags configured at startup
+        batch = TaggedInsert(self.colored_messages)
+        for line, details, event in lines:
+            if details is None:
+                batch.add_line(line, event)
+            else:
+                self.burst_counter += 1
+                tag = f"burst{self.burst_counter}"
+                self.burst_details[tag] = details
+                batch.add(line, ("burst", tag))
+                batch.add("\n")
+        
+        text_widget.configure(state=tk.NORMAL)
+        batch.insert(text_widget)
+        
+        # Limit message history
+        line_count = int(text_widget.index('end-1c').split('.')[0])
+        if line_count > self.max_messages:
+            # Delete oldest messages to stay within limit
+            delete_count = line_count - self.max_messages
+            text_widget.delete(1.0, f"{delete_count + 1}.0")
+        
+        text_widget.see(tk.END)  # Auto-scroll to bottom, only reached while view follows it
+        text_widget.configure(state=tk.DISABLED)
+        
+        # Forget details of summaries that scrolled out of history
+        while len(self.burst_details) > self.max_burst_details:
+            tag = next(iter(self.burst_details))
+            del self.burst_details[tag]
+            self.incoming_text.tag_delete(tag)
+            self.outgoing_text.tag_delete(tag)
     
     def update_text_widgets(self):
         """Updates text widgets with buffered messages at controlled rate"""
+        # Records and statuses from client process arrive through pipe
+        if self.client_in_process and self.client:
+            self.client.poll(self)
+        
+        # Control lane goes first, connection state stays accurate under any feed load
+        self.process_control_events()
+        
         current_time = time.time()
         
         # Only update if enough time has passed since last update
         if current_time - self.last_update_time >= self.update_interval:
             self.last_update_time = current_time
             
+            now = time.monotonic()
+            # Take messages added so far, client thread keeps appending meanwhile
+            backlog = len(self.message_buffer)
+            records = self.message_buffer[:backlog]
+            del self.message_buffer[:backlog]
+            if self.history_archive is not None and records:
+                self.history_archive.extend([(message, event) for message, pane_flags, event in records], current_time)
+            
+            # Switch to shedding if backlog or previous flush show GUI can't keep up, history keeps hidden messages
+            self.overload_guard.update(backlog, self.last_flush_time, now)
+            if self.overload_guard.active:
+                records = [record for record in records if self.overload_guard.admit(record[2])]
+            
+            # Only open player tab is rendered, sections still keep lines for session snapshot
+            if self.player_tabs:
+                if records:
+                    self.player_tabs.add([(message, event) for message, pane_flags, event in records])
+                    for message, pane_flags, event in records:
+                        if pane_flags & PANE_FLAGS["incoming"]:
+                            self.incoming_history.append(message)
+                        if pane_flags & PANE_FLAGS["outgoing"]:
+                            self.outgoing_history.append(message)
+                if self.player_tabs.has_pending():
+                    self.player_tabs.flush()
+                records = []
+            
             # Process incoming messages
-            if self.incoming_buffer:
-                self.incoming_text.configure(state=tk.NORMAL)
-                
-                # Add all buffered incoming messages
-                for msg in self.incoming_buffer:
-                    self.incoming_text.insert(tk.END, msg + "\n")
-                
-                # Clear the buffer
-                self.incoming_buffer.clear()
-                
-                # Limit message history
-                lines = int(self.incoming_text.index('end-1c').split('.')[0])
-                if lines > self.max_messages:
-                    # Delete oldest messages to stay within limit
-                    delete_count = lines - self.max_messages
-                    self.incoming_text.delete(1.0, f"{delete_count + 1}.0")
-                
-                self.incoming_text.see(tk.END)  # Auto-scroll to bottom
-                self.incoming_text.configure(state=tk.DISABLED)
+            if records or self.incoming_coalescer.has_pending() or self.incoming_scroll.has_held():
+                self.flush_buffer(self.incoming_text, records, PANE_FLAGS["incoming"], self.incoming_coalescer, self.incoming_history, self.incoming_scroll, now)
             
             # Process outgoing messages
-            if self.outgoing_buffer:
-                self.outgoing_text.configure(state=tk.NORMAL)
-                
-                # Add all buffered outgoing messages
-                for msg in self.outgoing_buffer:
-                    self.outgoing_text.insert(tk.END, msg + "\n")
-                
-                # Clear the buffer
-                self.outgoing_buffer.clear()
-                
-                # Limit message history
-                lines = int(self.outgoing_text.index('end-1c').split('.')[0])
-                if lines > self.max_messages:
-                    # Delete oldest messages to stay within limit
-                    delete_count = lines - self.max_messages
-                    self.outgoing_text.delete(1.0, f"{delete_count + 1}.0")
-                
-                self.outgoing_text.see(tk.END)  # Auto-scroll to bottom
-                self.outgoing_text.configure(state=tk.DISABLED)
+            if records or self.outgoing_coalescer.has_pending() or self.outgoing_scroll.has_held():
+                self.flush_buffer(self.outgoing_text, records, PANE_FLAGS["outgoing"], self.outgoing_coalescer, self.outgoing_history, self.outgoing_scroll, now)
+            
+            self.last_flush_time = time.monotonic() - now
+            self.update_overload_banner()
+            
+            # Update traffic counters only when they change
+            if self.client:
+                traffic = self.client.stats.summary()
+                if traffic != self.traffic_label.cget("text"):
+                    self.traffic_label.config(text=traffic)
         
         # Schedule next update
         self.root.after(int(self.update_interval * 1000), self.update_text_widgets)
     
+    def update_overload_banner(self):
+        """Shows hidden message counts while there are any"""
+        banner = self.overload_guard.banner_text()
+        if banner == self.overload_banner.cget("text"):
+            return
+        
+        self.overload_banner.config(text=banner)
+        if banner:
+            self.overload_banner.pack(fill=tk.X, pady=(0, 10), before=self.content_frame)
+        else:
+            self.overload_banner.pack_forget()
+    
     def start_queue_processing(self):
         """Starts message processing"""
         self.update_text_widgets()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import tkinter as tk
+from collections import deque
+
+# User input that can move view of Text widget
+SCROLL_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Prior>", "<Next>", "<Up>", "<Down>",
+                 "<Control-Home>", "<Control-End>", "<B1-Motion>")
+
+class AutoScroll:
+    """Follows end of Text widget while user is at bottom.
+    After user scrolls up, new lines are held back and widget isn't touched until user returns"""
+    def __init__(self, text_widget, indicator, max_lines):
+        self.text_widget = text_widget
+        self.indicator = indicator  # Label with held back count, packed only while detached
+        self.attached = True
+        self.held = deque(maxlen=max_lines)  # Older held lines wouldn't stay in widget anyway
+        self.held_count = 0  # Messages arrived while detached, including ones that fell out of held
+
+        for sequence in SCROLL_EVENTS:
+            # Class bindings move view after widget bindings, check position once they are done
+            text_widget.bind(sequence, lambda e: self.text_widget.after_idle(self.check_position), add=True)
+        indicator.bind("<Button-1>", lambda e: self.scroll_to_end())
+
+    def check_position(self):
+        attached = self.text_widget.yview()[1] >= 1.0
+        if attached == self.attached:
+            return
+        self.attached = attached
+        if attached:
+            # Held lines are inserted on next flush
+            self.indicator.pack_forget()
+        else:
+            self.update_indicator()
+
+    def hold(self, lines):
+        """Keeps lines for later, returns True if view is detached and lines were held"""
+        if self.attached:
+            return False
+        if lines:
+            self.held.extend(lines)
+            self.held_count += len(lines)
+            self.update_indicator()
+        return True
+
+    def take(self, lines):
+        """Returns held lines followed by new ones, once view is attached again"""
+        if not self.held:
+            return lines
+        held = list(self.held) + lines
+        self.held.clear()
+        self.held_count = 0
+        return held
+
+    def has_held(self):
+        return self.attached and bool(self.held)
+
+    def update_indicator(self):
+        count = self.held_count
+        self.indicator.config(text=f"▼ {count} new {'message' if count == 1 else 'messages'}" if count else "▼ Back to latest")
+        if not self.indicator.winfo_ismapped():
+            self.indicator.pack(side=tk.BOTTOM, fill=tk.X, before=self.text_widget)
+
+    def scroll_to_end(self):
+        self.text_widget.see(tk.END)
+        self.attached = True
+        self.indicator.pack_forget()
+
+    def set_max_lines(self, max_lines):
+        self.held = deque(self.held, maxlen=max_lines)
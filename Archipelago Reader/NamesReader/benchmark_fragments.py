@@ -0,0 +1,129 @@
+import io
+import sys
+import asyncio
+import json
+import time
+import random
+import tempfile
+import contextlib
+from data_package_cache import DataPackageCache
+from data_package_manager import DataPackageManager
+from message_processor import MessageProcessor, FRAGMENT_CACHE_SIZE
+
+# Compares PrintJSON resolution with and without fragment cache
+# Usage: python benchmark_fragments.py [recording.jsonl]
+# Recording has one server frame (JSON list of messages) per line, frames with
+# Connected and DataPackage are used for setup, PrintJSON messages are measured.
+# Without recording, traffic shaped like a release in a 30 player room is generated.
+# Name tables are mapped from disk cache like in the reader, both variants run alternately.
+
+ROUNDS = 7
+
+def generate_traffic(players=30, items_per_game=500, locations_per_game=1000, messages=20000, unknown_games=2):
+    """Returns frames of synthetic room, few players send most of items like during release.
+    Items belong to receiver's game as in real rooms, so most of them are looked up in another game than sender's.
+    Last unknown_games slots have no data package, their IDs take the unknown name path"""
+    random.seed(1)
+    games = {f"Game {slot}": slot for slot in range(1, players + 1)}
+    data_package = {"games": {
+        game: {
+            "checksum": f"checksum{slot}",
+            "item_name_to_id": {f"{game} Item {i}": slot * 100000 + i for i in range(items_per_game)},
+            "location_name_to_id": {f"{game} Location {i}": slot * 100000 + i for i in range(locations_per_game)}
+        }
+        for game, slot in games.items()
+        if slot <= players - unknown_games
+    }}
+    connected = {
+        "cmd": "Connected",
+        "players": [{"slot": slot, "name": f"Player{slot}"} for slot in games.values()],
+        "slot_info": {str(slot): {"game": game} for game, slot in games.items()}
+    }
+
+    feed = []
+    for _ in range(messages):
+        sender = random.choice([1, 2, 3, 3, 3, random.randint(1, players)])
+        receiver = random.randint(1, players)
+        feed.append({"cmd": "PrintJSON", "type": "ItemSend", "data": [
+            {"type": "player_id", "text": str(sender)},
+            {"type": "text", "text": " sent "},
+            # Popular items repeat a lot, as progression items and fillers do in real rooms
+            {"type": "item_id", "text": str(receiver * 100000 + int(random.paretovariate(1.2)) % items_per_game),
+             "player": receiver, "flags": 1},
+            {"type": "text", "text": " to "},
+            {"type": "player_id", "text": str(receiver)},
+            {"type": "text", "text": " ("},
+            {"type": "location_id", "text": str(sender * 100000 + random.randrange(locations_per_game)), "player": sender},
+            {"type": "text", "text": ")"}
+        ]})
+    return [[connected], [{"cmd": "DataPackage", "data": data_package}], feed]
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def create_processor(frames, cache_directory, fragment_cache_size):
+    """Returns processor set up from control messages and PrintJSON feed of frames"""
+    processor = MessageProcessor([], DataPackageManager(DataPackageCache(cache_directory)),
+                                 fragment_cache_size=fragment_cache_size)
+    feed = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in frames:
+            for msg in frame:
+                if msg.get("cmd") == "PrintJSON":
+                    feed.append(msg)
+                elif msg.get("cmd") in ("Connected", "DataPackage", "RoomUpdate"):
+                    asyncio.run(processor.process_message(msg, None))
+    return processor, feed
+
+def run_feed(processor, feed):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for msg in feed:
+            processor.resolve_print_json(msg)
+    return time.perf_counter() - started
+
+def get_fragments(processor, feed):
+    """Returns (kind, game, id) of every item and location part, as resolve_print_json looks them up"""
+    fragments = []
+    for msg in feed:
+        data = msg.get("data", [])
+        slots = [int(part["text"]) for part in data if part.get("type") == "player_id" and part.get("text", "").isdigit()]
+        sender = slots[0] if slots else None
+        receiver = slots[1] if len(slots) > 1 else sender
+        for part in data:
+            kind = {"item_id": "item", "location_id": "location"}.get(part.get("type"))
+            if kind and part.get("text", "").isdigit():
+                fragments.append((kind, processor.get_part_game(part, sender, receiver), int(part["text"])))
+    return fragments
+
+def run_fragments(processor, fragments):
+    started = time.perf_counter()
+    for kind, game_name, fragment_id in fragments:
+        processor.resolve_fragment(kind, game_name, fragment_id)
+    return time.perf_counter() - started
+
+def main():
+    frames = load_recording(sys.argv[1]) if len(sys.argv) > 1 else generate_traffic()
+    with tempfile.TemporaryDirectory() as cache_directory:
+        uncached_processor, feed = create_processor(frames, cache_directory, 0)
+        cached_processor, _ = create_processor(frames, cache_directory, FRAGMENT_CACHE_SIZE)
+        fragments = get_fragments(uncached_processor, feed)
+        # Alternate variants so machine load affects both the same way
+        uncached = cached = uncached_fragments = cached_fragments = float("inf")
+        for _ in range(ROUNDS):
+            uncached = min(uncached, run_feed(uncached_processor, feed))
+            cached = min(cached, run_feed(cached_processor, feed))
+            uncached_fragments = min(uncached_fragments, run_fragments(uncached_processor, fragments))
+            cached_fragments = min(cached_fragments, run_fragments(cached_processor, fragments))
+    count = max(len(feed), 1)
+    fragment_count = max(len(fragments), 1)
+    print(f"📊 Fragment cache benchmark, {len(feed)} PrintJSON messages, {len(fragments)} names, best of {ROUNDS}")
+    print(f"Names without cache:    {uncached_fragments / fragment_count * 1e6:.2f} µs per name")
+    print(f"Names with cache:       {cached_fragments / fragment_count * 1e6:.2f} µs per name "
+          f"({(1 - cached_fragments / uncached_fragments) * 100:.0f}% faster)")
+    print(f"Messages without cache: {uncached / count * 1e6:.2f} µs per message")
+    print(f"Messages with cache:    {cached / count * 1e6:.2f} µs per message ({(1 - cached / uncached) * 100:.0f}% faster)")
+
+if __name__ == "__main__":
+    main()
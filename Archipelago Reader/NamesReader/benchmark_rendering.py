@@ -0,0 +1,74 @@
+import io
+import time
+import asyncio
+import contextlib
+import tkinter as tk
+from benchmark_fragments import generate_traffic
+from data_package_manager import DataPackageManager
+from message_processor import MessageProcessor
+from text_tags import DEFAULT_MESSAGE_COLORS, TaggedInsert, configure_tags
+
+# Compares plain and colored insertion into Text widget during a flood
+# Usage: python benchmark_rendering.py (needs display)
+
+BATCH_SIZE = 500  # Messages per flush, like one GUI tick during release
+MAX_MESSAGES = 1000
+ROUNDS = 3
+
+def resolve_traffic():
+    """Returns (line, event) of synthetic release traffic"""
+    frames = generate_traffic(messages=20000)
+    processor = MessageProcessor([], DataPackageManager())
+    with contextlib.redirect_stdout(io.StringIO()):
+        for msg in frames[0] + frames[1]:
+            asyncio.run(processor.process_message(msg, None))
+        records = [processor.resolve_print_json(msg) for msg in frames[2]]
+    return [(line, event) for line, pane_flags, event, broadcast in records if line]
+
+def flush_per_line(text_widget, batch):
+    for line, event in batch:
+        text_widget.insert(tk.END, line + "\n")
+
+def flush_tagged(colored):
+    def flush(text_widget, batch):
+        inserter = TaggedInsert(colored)
+        for line, event in batch:
+            inserter.add_line(line, event)
+        inserter.insert(text_widget)
+    return flush
+
+def measure(root, lines, flush):
+    """Returns seconds per message, including layout of visible lines"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        text_widget = tk.Text(root, width=100, height=40)
+        text_widget.pack()
+        configure_tags(text_widget, DEFAULT_MESSAGE_COLORS)
+        root.update()
+        started = time.perf_counter()
+        for start in range(0, len(lines), BATCH_SIZE):
+            flush(text_widget, lines[start:start + BATCH_SIZE])
+            line_count = int(text_widget.index("end-1c").split(".")[0])
+            if line_count > MAX_MESSAGES:
+                text_widget.delete(1.0, f"{line_count - MAX_MESSAGES + 1}.0")
+            text_widget.see(tk.END)
+            root.update_idletasks()
+        best = min(best, time.perf_counter() - started)
+        text_widget.destroy()
+    return best / len(lines)
+
+def main():
+    lines = resolve_traffic()
+    root = tk.Tk()
+    results = [
+        ("Insert per line, plain", measure(root, lines, flush_per_line)),
+        ("Batched insert, plain", measure(root, lines, flush_tagged(False))),
+        ("Batched insert, colored", measure(root, lines, flush_tagged(True)))
+    ]
+    root.destroy()
+    print(f"📊 Rendering benchmark, {len(lines)} messages in batches of {BATCH_SIZE}, best of {ROUNDS}")
+    for name, seconds in results:
+        print(f"{name}: {seconds * 1e6:.2f} µs per message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import subprocess
+import statistics
+
+# Measures startup in fresh interpreters so every run pays full import cost
+# Usage: python benchmark_startup.py [runs]
+
+HEAVY_MODULES = ["asyncio", "websockets", "uuid", "threading", "json"]
+
+MEASURE_SCRIPT = r'''
+import sys, time, json
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+result = {
+    "import": imported - started,
+    "loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+    "window": None
+}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+    gui = main.ArchipelagoGUI(root)
+    root.update()
+    result["window"] = time.perf_counter() - started
+    root.destroy()
+except tk.TclError as e:
+    result["error"] = str(e)
+print(json.dumps(result))
+'''
+
+def measure_once():
+    """Runs single startup in new process, returns measured times"""
+    script = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n" + MEASURE_SCRIPT
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    # GUI may print to console before result, it is always on last line
+    return json.loads(output.strip().splitlines()[-1])
+
+def format_times(times):
+    return f"median {statistics.median(times) * 1000:.1f}ms, min {min(times) * 1000:.1f}ms, max {max(times) * 1000:.1f}ms"
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = [measure_once() for _ in range(runs)]
+
+    print(f"📊 Startup benchmark, {runs} runs")
+    print(f"Import main:        {format_times([r['import'] for r in results])}")
+    window_times = [r["window"] for r in results if r["window"] is not None]
+    if window_times:
+        print(f"First window paint: {format_times(window_times)}")
+    else:
+        print(f"First window paint: skipped ({results[0].get('error')})")
+    loaded = results[0]["loaded"]
+    print(f"Loaded before connect: {', '.join(loaded) if loaded else 'none of ' + ', '.join(HEAVY_MODULES)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import websockets
+
+class BroadcastServer:
+    """Rebroadcasts resolved messages to local subscribers (overlays, second monitors)"""
+    def __init__(self, host, port, queue_size):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.subscribers = {}  # Bounded queue per subscriber -> its connection
+        self.server = None
+        self.dropped_subscribers = 0
+
+    async def start(self):
+        """Starts accepting local subscribers"""
+        try:
+            self.server = await websockets.serve(self.handler, self.host, self.port)
+            print(f"📡 Broadcasting messages on ws://{self.host}:{self.port}")
+            return True
+        except Exception as e:
+            print(f"❌ Broadcast server error: {e}")
+            return False
+
+    async def stop(self):
+        """Disconnects subscribers and stops server"""
+        if self.server:
+            # Handlers wait on their queues, wake them up so they can finish
+            for queue in list(self.subscribers):
+                self.stop_subscriber(queue)
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+            print("✅ Broadcast server stopped")
+
+    async def handler(self, websocket):
+        """Sends queued messages to single subscriber"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers[queue] = websocket
+        print(f"📡 Subscriber connected ({len(self.subscribers)} total)")
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is None:
+                    # Subscriber couldn't keep up and was dropped
+                    break
+                await websocket.send(payload)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.subscribers.pop(queue, None)
+            print(f"📡 Subscriber disconnected ({len(self.subscribers)} total)")
+
+    def publish(self, event):
+        """Queues event for every subscriber, dropping ones whose buffer is full"""
+        if not self.subscribers:
+            return
+
+        # Encode once, all subscribers share the same payload
+        payload = json.dumps(event)
+        for queue, websocket in list(self.subscribers.items()):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self.drop_subscriber(queue, websocket)
+
+    def drop_subscriber(self, queue, websocket):
+        """Disconnects subscriber that can't keep up"""
+        self.dropped_subscribers += 1
+        self.stop_subscriber(queue)
+        # Handler may be stuck sending to subscriber that stopped reading
+        websocket.transport.abort()
+        print("⚠️ Dropped slow broadcast subscriber")
+
+    def stop_subscriber(self, queue):
+        """Replaces pending messages with stop signal"""
+        self.subscribers.pop(queue, None)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
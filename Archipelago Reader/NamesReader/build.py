@@ -6,10 +6,24 @@ files = [
     "main.py",
     "archipelago_client.py",
     "archipelago_gui.py",
+    "autoscroll.py",
+    "broadcast_server.py",
+    "burst_coalescer.py",
+    "client_process.py",
     "config.py",
     "config_manager.py",
+    "data_package_cache.py",
     "data_package_manager.py",
-    "message_processor.py"
+    "filter_rules.py",
+    "history_archive.py",
+    "history_view.py",
+    "message_processor.py",
+    "name_index.py",
+    "overload_guard.py",
+    "player_tabs.py",
+    "session_snapshot.py",
+    "text_tags.py",
+    "transport.py"
 ]
 
 # Form arguments for PyInstaller
@@ -0,0 +1,75 @@
+from collections import deque
+
+class BurstGroup:
+    """Item sends from one player collected during a burst"""
+    def __init__(self, sender, started):
+        self.sender = sender
+        self.started = started
+        self.last = started
+        self.lines = []
+        self.receivers = set()
+
+    def add(self, message, event, now):
+        self.lines.append(message)
+        self.last = now
+        if event.get("receiver"):
+            self.receivers.add(event["receiver"])
+
+    def summary(self):
+        """Returns grouped summary line with exact counts"""
+        items = "item" if len(self.lines) == 1 else "items"
+        players = "player" if len(self.receivers) == 1 else "players"
+        return f"📢 {self.sender} sent {len(self.lines)} {items} to {len(self.receivers)} {players} ▸"
+
+class BurstCoalescer:
+    """Collapses floods of item sends from one player (release/collect) into summary lines"""
+    def __init__(self, threshold, window):
+        self.threshold = threshold  # Messages from one sender within window that start a burst
+        self.window = window  # Seconds
+        self.recent = {}  # Sender -> times of recent messages
+        self.groups = {}  # Sender -> open burst group
+        self.hot = {}  # Sender -> time of last message of previous group
+
+    def add(self, message, event, now):
+        """Returns list of (line, details) to show now, details is None for plain lines"""
+        sender = event.get("sender") if event and event.get("type") == "ItemSend" else None
+        if sender is None:
+            return [(message, None)]
+
+        group = self.groups.get(sender)
+        if group is None:
+            # Sender was still bursting when previous summary was emitted
+            if now - self.hot.pop(sender, float("-inf")) <= self.window:
+                group = self.groups[sender] = BurstGroup(sender, now)
+            else:
+                times = self.recent.setdefault(sender, deque())
+                times.append(now)
+                while now - times[0] > self.window:
+                    times.popleft()
+                if len(times) < self.threshold:
+                    return [(message, None)]
+                # Burst detected, collapse this and following messages
+                del self.recent[sender]
+                group = self.groups[sender] = BurstGroup(sender, now)
+
+        group.add(message, event, now)
+        return []
+
+    def flush(self, now):
+        """Returns summaries of groups that are quiet or open for a whole window"""
+        ready = []
+        for sender, group in list(self.groups.items()):
+            if now - group.last >= self.window:
+                # Burst ended
+                del self.groups[sender]
+            elif now - group.started >= self.window:
+                # Still going, emit summary so far and keep collapsing
+                del self.groups[sender]
+                self.hot[sender] = group.last
+            else:
+                continue
+            ready.append((group.summary(), group.lines))
+        return ready
+
+    def has_pending(self):
+        return bool(self.groups)
@@ -0,0 +1,181 @@
+import multiprocessing
+import threading
+import queue
+
+# Child process owns network, JSON decoding and name resolution, GUI process only renders.
+# Child -> GUI control pipe carries ("status", (status, success, retrying)) and ("state", {...})
+# Child -> GUI feed pipe carries record batches, one per frame, written by its own thread
+# GUI -> child pipe carries single "close" command
+
+STATE_INTERVAL = 1.0  # Seconds between state reports (traffic, players, games)
+FEED_CLOSE_TIMEOUT = 5.0  # Seconds to wait for queued batches when client stops
+
+class PipeSink:
+    """Stands in for GUI inside child process, forwards everything over pipe"""
+    def __init__(self, events, feed):
+        self.events = events
+        self.feed = feed
+        # Full pipe only blocks writer thread, event loop keeps pinging and handling control messages
+        self.feed_queue = queue.SimpleQueue()
+        self.feed_writer = threading.Thread(target=self.write_feed, daemon=True)
+        self.feed_writer.start()
+
+    def add_records(self, records):
+        self.feed_queue.put(records)
+
+    def write_feed(self):
+        while True:
+            records = self.feed_queue.get()
+            if records is None:
+                return
+            try:
+                # Whole frame goes in one pickle
+                self.feed.send(records)
+            except (OSError, ValueError):
+                # GUI process is gone
+                return
+
+    def close_feed(self):
+        """Lets writer send batches still queued, called once client has stopped"""
+        self.feed_queue.put(None)
+        self.feed_writer.join(FEED_CLOSE_TIMEOUT)
+
+    def update_connection_status(self, status, success=True, retrying=False):
+        self.events.send(("status", (status, success, retrying)))
+
+    def send_state(self, client):
+        processor = client.message_processor
+        self.events.send(("state", {
+            "traffic": client.stats.summary(),
+            "players": dict(processor.players),
+            "slot_games": dict(processor.slot_games),
+            "data_package": client.data_package_manager.get_references()
+        }))
+
+def run_client_process(target_players, players, slot_games, events, feed, commands):
+    """Entry point of child process"""
+    import asyncio
+    from archipelago_client import ArchipelagoClient
+
+    sink = PipeSink(events, feed)
+    try:
+        client = ArchipelagoClient(target_players, sink)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sink.update_connection_status("Connection Failed", False)
+        return
+    client.message_processor.restore_tables(players, slot_games)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    def wait_for_close():
+        # Also ends when GUI process is gone and pipe is closed
+        try:
+            commands.recv()
+        except EOFError:
+            pass
+        asyncio.run_coroutine_threadsafe(client.close(), loop)
+
+    threading.Thread(target=wait_for_close, daemon=True).start()
+
+    async def report_state():
+        while True:
+            await asyncio.sleep(STATE_INTERVAL)
+            sink.send_state(client)
+
+    async def run():
+        reporter = asyncio.create_task(report_state())
+        try:
+            await client.connect()
+        finally:
+            reporter.cancel()
+
+    try:
+        loop.run_until_complete(run())
+    except Exception as e:
+        print(f"Error in client process: {e}")
+    finally:
+        sink.close_feed()
+        # Last state is used for session snapshot
+        sink.send_state(client)
+        loop.close()
+
+class RemoteStats:
+    """Traffic summary last reported by child process"""
+    def __init__(self):
+        self.text = ""
+
+    def summary(self):
+        return self.text
+
+class ClientProcess:
+    """Runs ArchipelagoClient in child process, used by GUI like local client"""
+    def __init__(self, target_players):
+        self.target_players = target_players
+        self.stats = RemoteStats()
+        self.players = {}
+        self.slot_games = {}
+        self.data_package_refs = {}
+        self.process = None
+        self.events = None
+        self.feed = None
+        self.commands = None
+        self.max_batches_per_poll = 50  # Record batches handled per GUI tick, control pipe is always drained
+
+    def restore_tables(self, players, slot_games):
+        """Tables from session snapshot, passed to child when it starts"""
+        self.players = dict(players)
+        self.slot_games = dict(slot_games)
+
+    def get_tables(self):
+        return dict(self.players), dict(self.slot_games)
+
+    def get_data_package_refs(self):
+        return dict(self.data_package_refs)
+
+    def start(self):
+        self.events, child_events = multiprocessing.Pipe(duplex=False)
+        self.feed, child_feed = multiprocessing.Pipe(duplex=False)
+        child_commands, self.commands = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=run_client_process,
+            args=(self.target_players, self.players, self.slot_games, child_events, child_feed, child_commands),
+            daemon=True
+        )
+        self.process.start()
+        # Child keeps its own ends, closing ours lets EOF reach the other side
+        child_events.close()
+        child_feed.close()
+        child_commands.close()
+
+    def close(self):
+        """Asks child to disconnect, it exits once client stops"""
+        try:
+            self.commands.send("close")
+        except (OSError, ValueError):
+            pass
+
+    def poll(self, gui):
+        """Hands what child sent since last tick to GUI, statuses go first no matter how much feed waits"""
+        try:
+            while self.events.poll():
+                kind, payload = self.events.recv()
+                if kind == "status":
+                    gui.update_connection_status(*payload)
+                elif kind == "state":
+                    self.stats.text = payload["traffic"]
+                    self.players = payload["players"]
+                    self.slot_games = payload["slot_games"]
+                    self.data_package_refs = payload["data_package"]
+        except (EOFError, OSError):
+            # Child exited, nothing more will come
+            pass
+
+        try:
+            for _ in range(self.max_batches_per_poll):
+                if not self.feed.poll():
+                    return
+                gui.add_records(self.feed.recv())
+        except (EOFError, OSError):
+            pass
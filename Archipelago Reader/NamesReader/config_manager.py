@@ -19,7 +19,46 @@ def get_default_config():
         "FONT_FAMILY": "TkDefaultFont",
         "BG_COLOR": "#0D141C",
         "TEXT_COLOR": "#9CCAFF",
-        "WIDGET_BG_COLOR": "#242B33"
+        "WIDGET_BG_COLOR": "#242B33",
+        "AUTO_RECONNECT": True,
+        "RECONNECT_BASE_DELAY": 1.0,
+        "RECONNECT_MAX_DELAY": 60.0,
+        "RECONNECT_MAX_ATTEMPTS": 0,
+        "CONNECTION_PROFILE": "game",
+        "WS_COMPRESSION": "deflate",
+        "WS_PING_INTERVAL": 20,
+        "WS_PING_TIMEOUT": 20,
+        "WS_CLOSE_TIMEOUT": 10,
+        "WS_MAX_QUEUE": 16,
+        "WS_WRITE_LIMIT": 32768,
+        "HEADLESS_STATS_INTERVAL": 60,
+        "WATCHDOG_ENABLED": True,
+        "WATCHDOG_PING_INTERVAL": 5,
+        "WATCHDOG_PONG_TIMEOUT": 5,
+        "BROADCAST_ENABLED": False,
+        "BROADCAST_HOST": "127.0.0.1",
+        "BROADCAST_PORT": 38282,
+        "BROADCAST_QUEUE_SIZE": 256,
+        "BURST_COALESCING": True,
+        "BURST_THRESHOLD": 10,
+        "BURST_WINDOW": 1.0,
+        "OVERLOAD_BACKLOG": 2000,
+        "OVERLOAD_FLUSH_TIME": 0.05,
+        "OVERLOAD_SAMPLE_RATE": 10,
+        "OVERLOAD_COOLDOWN": 3.0,
+        "ITEM_CLASSES": [],
+        "ROUTING_RULES": [],
+        "SESSION_SNAPSHOT": True,
+        "SNAPSHOT_MESSAGES": 200,
+        "PLAYER_TABS": False,
+        "PLAYER_TAB_MESSAGES": 500,
+        "CLIENT_PROCESS": False,
+        "NAME_TABLE_BUDGET_MB": 64,
+        "HISTORY_ARCHIVE": True,
+        "HISTORY_BLOCK_SIZE": 1000,
+        "HISTORY_ARCHIVE_MB": 32,
+        "COLORED_MESSAGES": True,
+        "MESSAGE_COLORS": {}
     }
 
 def get_config_path():
@@ -31,6 +70,10 @@ def get_config_path():
         # If application is running from source code
         return os.path.join(os.path.dirname(__file__), "config.py")
 
+def get_data_path(file_name):
+    """Returns path of file stored next to config"""
+    return os.path.join(os.path.dirname(get_config_path()), file_name)
+
 def load_config():
     """Loads configuration from file"""
     global runtime_config
@@ -45,7 +88,7 @@ SERVER_URI = "wss://localhost:38281"
 PLAYER_NAME = "lewapro"
 PASSWORD = ""
 GAME = "Manual_TeamFortress2_GP"
-TARGET_PLAYERS = []  # Empty list will show all messages
+TARGET_PLAYERS = []  # Names, globs (lewapro*) or regexes (re:lewapro.+). Empty list will show all messages
 MAX_MESSAGE_SIZE = 10485760  # 10 MB
 MAX_MESSAGES = 1000
 FONT_SIZE = 12
@@ -53,6 +96,48 @@ FONT_FAMILY = "TkDefaultFont"
 BG_COLOR = "#0D141C"
 TEXT_COLOR = "#9CCAFF"
 WIDGET_BG_COLOR = "#242B33"
+AUTO_RECONNECT = True  # Reconnect automatically when server drops connection
+RECONNECT_BASE_DELAY = 1.0  # Seconds before first reconnect attempt
+RECONNECT_MAX_DELAY = 60.0  # Upper limit for delay between attempts
+RECONNECT_MAX_ATTEMPTS = 0  # 0 means retry forever
+CONNECTION_PROFILE = "game"  # "game" connects as full game client, "text" or "tracker" only read messages
+WS_COMPRESSION = "deflate"  # None disables permessage-deflate
+WS_PING_INTERVAL = 20  # Seconds between keepalive pings, None disables them
+WS_PING_TIMEOUT = 20  # Seconds to wait for pong before dropping connection
+WS_CLOSE_TIMEOUT = 10
+WS_MAX_QUEUE = 16  # Incoming frames buffered before reading pauses
+WS_WRITE_LIMIT = 32768  # Bytes buffered before sending pauses
+HEADLESS_STATS_INTERVAL = 60  # Seconds between traffic reports in headless mode, 0 disables them
+WATCHDOG_ENABLED = True  # Detect dead connections quickly and reconnect
+WATCHDOG_PING_INTERVAL = 5  # Ping server after this many seconds without any data
+WATCHDOG_PONG_TIMEOUT = 5  # Consider connection dead if pong doesn't arrive in time
+BROADCAST_ENABLED = False  # Rebroadcast shown messages to overlays on local WebSocket
+BROADCAST_HOST = "127.0.0.1"
+BROADCAST_PORT = 38282
+BROADCAST_QUEUE_SIZE = 256  # Subscribers falling this many messages behind are dropped
+BURST_COALESCING = True  # Collapse release/collect floods into clickable summary lines
+BURST_THRESHOLD = 10  # Item sends from one player within window that start collapsing
+BURST_WINDOW = 1.0  # Seconds
+OVERLOAD_BACKLOG = 2000  # Waiting messages that switch to showing important messages only
+OVERLOAD_FLUSH_TIME = 0.05  # Seconds per screen update that switch to overload mode too
+OVERLOAD_SAMPLE_RATE = 10  # In overload, show one of this many useful, trap and other messages
+OVERLOAD_COOLDOWN = 3.0  # Seconds without overload before showing everything again
+ITEM_CLASSES = []  # Show only these item classes: "progression", "useful", "trap", "filler". Empty shows all
+# Rules like: receiver in {Alice, Bob} and flags.progression -> incoming, broadcast
+# Fields: sender, receiver, type, kind (sent/received/found), flags.<item class>, "in targets" uses TARGET_PLAYERS
+ROUTING_RULES = []  # Empty routes by TARGET_PLAYERS as before
+SESSION_SNAPSHOT = True  # Save session on exit and show it right away on next start
+SNAPSHOT_MESSAGES = 200  # Messages per section kept in session snapshot
+PLAYER_TABS = False  # Show one tab per player instead of Received/Sent sections
+PLAYER_TAB_MESSAGES = 500  # Messages kept per player tab
+CLIENT_PROCESS = False  # Run network and message processing in separate process, keeps window responsive
+NAME_TABLE_BUDGET_MB = 64  # Cached name indexes kept mapped, least used games are mapped again when needed. 0 is unlimited
+# Mapped indexes are shared with other readers through OS cache. Games without checksum are kept in memory outside this budget
+HISTORY_ARCHIVE = True  # Keep whole session history, browsable and searchable in History window
+HISTORY_BLOCK_SIZE = 1000  # Older messages are compressed in blocks of this many lines
+HISTORY_ARCHIVE_MB = 32  # Compressed history kept, oldest blocks are dropped over it. 0 is unlimited
+COLORED_MESSAGES = True  # Color players, items by class and locations like Archipelago clients do
+MESSAGE_COLORS = {}  # Color overrides like {"player": "#EE00EE"}. Parts: player, progression, useful, trap, filler, location
 '''
         with open(config_path, 'w', encoding='utf-8') as f:
             f.write(default_config_str)
@@ -111,6 +196,12 @@ def save_config(new_config):
             if line.strip().startswith(f"{key} ="):
                 lines[i] = f"{key} = {value_str}"
                 break
+        else:
+            # Older config files don't have newer settings yet
+            if lines[-1].strip():
+                lines.append(f"{key} = {value_str}")
+            else:
+                lines.insert(len(lines) - 1, f"{key} = {value_str}")
         
         content = '\n'.join(lines)
     
@@ -0,0 +1,43 @@
+import os
+import re
+from name_index import write_name_index, open_name_index
+
+class DataPackageCache:
+    """Keeps name indexes of downloaded games on disk, one file per game and checksum.
+    Files are memory mapped, readers running at the same time share them through OS cache"""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get_path(self, game_name, checksum):
+        # Both come from server, neither may leave cache directory
+        safe_name = re.sub(r"[^\w-]", "_", game_name)
+        safe_checksum = re.sub(r"[^\w-]", "_", checksum)
+        return os.path.join(self.directory, f"{safe_name}-{safe_checksum}.idx")
+
+    def has(self, game_name, checksum):
+        return os.path.exists(self.get_path(game_name, checksum))
+
+    def load(self, game_name, checksum):
+        """Returns (items, locations) tables or None if game isn't cached or file is damaged"""
+        try:
+            return open_name_index(self.get_path(game_name, checksum))
+        except Exception as e:
+            print(f"❌ Error reading cached data package for {game_name}: {e}")
+            return None
+
+    def save(self, game_name, checksum, game_data):
+        """Writes index unless another reader already did, returns False on error"""
+        path = self.get_path(game_name, checksum)
+        if os.path.exists(path):
+            # Same checksum means same content, file may be mapped by other readers
+            return True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_name_index(path, game_data.get("item_name_to_id", {}), game_data.get("location_name_to_id", {}))
+            return True
+        except Exception as e:
+            if os.path.exists(path):
+                # Another reader published same index first, on Windows a mapped file can't be replaced
+                return True
+            print(f"❌ Error caching data package for {game_name}: {e}")
+            return False
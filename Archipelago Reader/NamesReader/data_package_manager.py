@@ -1,11 +1,138 @@
+import sys
 import json
+from collections import OrderedDict
+
+def estimate_table_size(mappings):
+    """Approximate memory used by ID -> name table in bytes, heap for dicts, mapped file for index tables"""
+    if isinstance(mappings, dict):
+        # Dict itself, int keys and name strings
+        return sys.getsizeof(mappings) + sum(28 + sys.getsizeof(name) for name in mappings.values())
+    return mappings.nbytes
 
 class DataPackageManager:
-    def __init__(self):
-        self.game_data_packages = {}
+    def __init__(self, cache=None, memory_budget=0):
         self.game_item_mappings = {}
         self.game_location_mappings = {}
+        self.game_checksums = {}  # Checksums of loaded games
+        self.server_games = []  # Games announced by server in RoomInfo
+        self.server_checksums = {}  # Checksums announced by server in RoomInfo
+        self.pending_games = set()  # Games requested but not received yet
+        self.full_request_pending = False
         self.loaded = False
+        self.cache = cache  # Optional DataPackageCache
+        self.cached_games = {}  # Game -> checksum available in cache, loaded on first use
+        # Bytes of mapped name indexes to keep open, 0 keeps everything. Mapped pages live in OS cache shared
+        # by all readers, so this bounds address space and resident pages of this reader, not private memory
+        self.memory_budget = memory_budget
+        self.table_sizes = OrderedDict()  # Game with mapped tables -> their size, least recently used first
+        self.table_memory = 0
+        self.heap_sizes = {}  # Game with dict tables -> their size, these can't be reloaded and are never evicted
+        self.heap_memory = 0
+        self.table_hits = 0  # Lookups in loaded games
+        self.table_misses = 0  # Lookups that had to load game from cache
+        self.table_evictions = 0
+        self.missing_ids = set()  # (kind, ID) no loaded or cached game has, until new names arrive
+        self.table_generation = 0  # Changes whenever tables are loaded, evicted or restored, resolved names may differ
+    
+    def update_server_info(self, games, checksums):
+        """Stores games and data package checksums announced by server"""
+        self.server_games = list(games)
+        self.server_checksums = dict(checksums)
+    
+    def add_server_info(self, games, checksums):
+        """Merges games and checksums announced by server after connecting"""
+        for game_name in games:
+            if game_name not in self.server_games:
+                self.server_games.append(game_name)
+        self.server_checksums.update(checksums)
+    
+    def reset_pending(self):
+        """Forgets requests sent over a previous connection"""
+        self.pending_games.clear()
+        self.full_request_pending = False
+    
+    def get_outdated_games(self):
+        """Returns games that need to be (re)downloaded, None if full data package is needed"""
+        if not self.server_checksums and not self.server_games:
+            # Server didn't tell us anything, only skip if we already have mappings
+            return [] if self.loaded or self.full_request_pending else None
+        
+        games = set(self.server_games) | set(self.server_checksums)
+        outdated = []
+        for game_name in sorted(games):
+            if game_name in self.pending_games:
+                continue
+            if game_name not in self.game_item_mappings and game_name not in self.cached_games:
+                if not self.restore_cached_game(game_name, self.server_checksums.get(game_name)):
+                    outdated.append(game_name)
+            elif game_name in self.server_checksums and self.game_checksums.get(game_name) != self.server_checksums[game_name]:
+                outdated.append(game_name)
+        return outdated
+    
+    def restore_cached_game(self, game_name, checksum):
+        """Marks game as available from cache, returns False if it isn't cached"""
+        if not self.cache or not checksum or not self.cache.has(game_name, checksum):
+            return False
+        self.cached_games[game_name] = checksum
+        self.game_checksums[game_name] = checksum
+        self.missing_ids.clear()
+        self.table_generation += 1
+        return True
+    
+    def restore_cached_games(self, data_package_refs):
+        """Marks games referenced by session snapshot as available from cache"""
+        for game_name, checksum in data_package_refs.items():
+            if game_name not in self.game_item_mappings:
+                self.restore_cached_game(game_name, checksum)
+    
+    def get_references(self):
+        """Returns game -> checksum of everything that can be loaded from cache"""
+        return dict(self.game_checksums)
+    
+    def _load_cached_game(self, game_name):
+        """Loads game mappings from cache when they are needed for the first time"""
+        checksum = self.cached_games.pop(game_name)
+        tables = self.cache.load(game_name, checksum)
+        if tables is None:
+            # Cache file is gone, next data package check will download it again
+            self.game_checksums.pop(game_name, None)
+            self.table_generation += 1
+            return
+        self._set_mappings(game_name, checksum, *tables)
+    
+    def _use_game(self, game_name):
+        """Loads game from cache if needed and marks it as recently used"""
+        if game_name in self.cached_games:
+            self.table_misses += 1
+            self._load_cached_game(game_name)
+        elif game_name in self.table_sizes:
+            self.table_hits += 1
+            self.table_sizes.move_to_end(game_name)
+        elif game_name in self.heap_sizes:
+            self.table_hits += 1
+    
+    def _enforce_budget(self, keep):
+        """Evicts least recently used games that can be reloaded from cache"""
+        if not self.memory_budget or not self.cache:
+            return
+        for game_name in list(self.table_sizes):
+            if self.table_memory <= self.memory_budget:
+                return
+            checksum = self.game_checksums.get(game_name)
+            if game_name == keep or not checksum or not self.cache.has(game_name, checksum):
+                continue
+            self.table_memory -= self.table_sizes.pop(game_name)
+            del self.game_item_mappings[game_name]
+            del self.game_location_mappings[game_name]
+            self.cached_games[game_name] = checksum
+            self.table_evictions += 1
+            self.table_generation += 1
+    
+    def get_table_stats(self):
+        """Returns one line summary of name table memory and cache use"""
+        return (f"{len(self.table_sizes)} games mapped, {self.table_memory / 1048576:.1f} MB, "
+                f"{len(self.heap_sizes)} in memory, {self.heap_memory / 1048576:.1f} MB, "
+                f"hits {self.table_hits}, misses {self.table_misses}, evictions {self.table_evictions}")
     
     async def request_data_package(self, websocket, games=None):
         """Requests data package via WebSocket connection"""
@@ -16,15 +143,17 @@ class DataPackageManager:
                 get_data_package_msg = [{"cmd": "GetDataPackage"}]
                 
             await websocket.send(json.dumps(get_data_package_msg))
+            if games:
+                self.pending_games.update(games)
+            else:
+                self.full_request_pending = True
             return True
         except Exception as e:
             print(f"❌ Error sending data package request: {e}")
             return False
     
     def process_data_package(self, data):
-        """Processes received data package"""
-        self.game_data_packages.update(data)
-        
+        """Processes received data package, raw package isn't kept once tables are built"""
         # Process all games in data package
         games_data = data.get('games', {})
         for game_name, game_data in games_data.items():
@@ -36,43 +165,114 @@ class DataPackageManager:
                 game_data = data[game_name]
                 self._load_mappings(game_name, game_data)
         
-        print(f"✅ Loaded mappings for games: {list(self.game_item_mappings.keys())}")
+        self.full_request_pending = False
+        print(f"✅ Loaded mappings for games: {list(self.game_item_mappings) + list(self.cached_games)}")
         return True
     
     def _load_mappings(self, game_name, game_data):
         """Loads mappings for specific game"""
+        checksum = game_data.get("checksum")
+        self.missing_ids.clear()
+        
+        # Mapped index on disk is shared with other readers, no own copy needed
+        if self.cache and checksum and self.cache.save(game_name, checksum, game_data):
+            tables = self.cache.load(game_name, checksum)
+            if tables:
+                self._set_mappings(game_name, checksum, *tables)
+                return
+        
         # Items
         item_name_to_id = game_data.get("item_name_to_id", {})
-        self.game_item_mappings[game_name] = {v: k for k, v in item_name_to_id.items()}
+        item_mappings = {v: k for k, v in item_name_to_id.items()}
         
         # Locations
         location_name_to_id = game_data.get("location_name_to_id", {})
-        self.game_location_mappings[game_name] = {v: k for k, v in location_name_to_id.items()}
+        location_mappings = {v: k for k, v in location_name_to_id.items()}
+        
+        self._set_mappings(game_name, checksum, item_mappings, location_mappings)
+    
+    def _set_mappings(self, game_name, checksum, item_mappings, location_mappings):
+        """Stores ID -> name tables of game, dicts or mapped index tables"""
+        self.game_item_mappings[game_name] = item_mappings
+        self.game_location_mappings[game_name] = location_mappings
+        
+        # Account size, replacing previous tables of game. Only mapped tables count for budget
+        size = estimate_table_size(item_mappings) + estimate_table_size(location_mappings)
+        self.table_memory -= self.table_sizes.pop(game_name, 0)
+        self.heap_memory -= self.heap_sizes.pop(game_name, 0)
+        if isinstance(item_mappings, dict):
+            self.heap_sizes[game_name] = size
+            self.heap_memory += size
+        else:
+            self.table_sizes[game_name] = size
+            self.table_memory += size
+            self._enforce_budget(keep=game_name)
         
+        if checksum:
+            self.game_checksums[game_name] = checksum
+        self.cached_games.pop(game_name, None)
+        self.pending_games.discard(game_name)
+        self.table_generation += 1
         self.loaded = True
     
+    def find_item_name(self, game_name, item_id):
+        """Gets item name by ID for specific game, None if it's unknown"""
+        self._use_game(game_name)
+        mappings = self.game_item_mappings.get(game_name)
+        return mappings.get(item_id) if mappings is not None else None
+    
+    def find_location_name(self, game_name, location_id):
+        """Gets location name by ID for specific game, None if it's unknown"""
+        self._use_game(game_name)
+        mappings = self.game_location_mappings.get(game_name)
+        return mappings.get(location_id) if mappings is not None else None
+    
+    def find_item_name_any_game(self, item_id):
+        """Tries to find item in any loaded or cached game, None if no game has it"""
+        return self._find_any_game("item", self.game_item_mappings, item_id)
+    
+    def find_location_name_any_game(self, location_id):
+        """Tries to find location in any loaded or cached game, None if no game has it"""
+        return self._find_any_game("location", self.game_location_mappings, location_id)
+    
+    def _find_any_game(self, kind, tables, fragment_id):
+        key = (kind, fragment_id)
+        if key in self.missing_ids:
+            return None
+        for game_name, mappings in tables.items():
+            name = mappings.get(fragment_id)
+            if name is not None:
+                return f"{name} ({game_name})"
+        # Cached games are only peeked at, loading each one would cycle all of them through budget
+        for game_name, checksum in list(self.cached_games.items()):
+            peeked = self.cache.load(game_name, checksum)
+            if peeked is None:
+                continue
+            name = peeked[0 if kind == "item" else 1].get(fragment_id)
+            if name is not None:
+                # Game is in use after all, keep its tables
+                self.table_misses += 1
+                self._set_mappings(game_name, checksum, *peeked)
+                return f"{name} ({game_name})"
+        self.missing_ids.add(key)
+        return None
+    
     def resolve_item_name(self, game_name, item_id):
         """Gets item name by ID for specific game"""
-        if game_name in self.game_item_mappings:
-            return self.game_item_mappings[game_name].get(item_id, f"Item {item_id}")
-        return f"Item {item_id}"
+        name = self.find_item_name(game_name, item_id)
+        return name if name is not None else f"Item {item_id}"
     
     def resolve_location_name(self, game_name, location_id):
         """Gets location name by ID for specific game"""
-        if game_name in self.game_location_mappings:
-            return self.game_location_mappings[game_name].get(location_id, f"Location {location_id}")
-        return f"Location {location_id}"
+        name = self.find_location_name(game_name, location_id)
+        return name if name is not None else f"Location {location_id}"
     
     def resolve_item_name_any_game(self, item_id):
         """Tries to find item in any game"""
-        for game_name, mappings in self.game_item_mappings.items():
-            if item_id in mappings:
-                return f"{mappings[item_id]} ({game_name})"
-        return f"Item {item_id}"
+        name = self.find_item_name_any_game(item_id)
+        return name if name is not None else f"Item {item_id}"
     
     def resolve_location_name_any_game(self, location_id):
         """Tries to find location in any game"""
-        for game_name, mappings in self.game_location_mappings.items():
-            if location_id in mappings:
-                return f"{mappings[location_id]} ({game_name})"
-        return f"Location {location_id}"
\ No newline at end of file
+        name = self.find_location_name_any_game(location_id)
+        return name if name is not None else f"Location {location_id}"
\ No newline at end of file
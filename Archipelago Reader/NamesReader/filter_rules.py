@@ -0,0 +1,191 @@
+import re
+
+# Rules look like: receiver in {A, B} and flags.progression -> incoming
+# Fields: sender, receiver, type (PrintJSON type), kind (sent, received, found)
+# Flags: flags.progression, flags.useful, flags.trap, flags.filler
+# Sets: {A, "Name with spaces"} or targets (slots matching TARGET_PLAYERS, sender and receiver only)
+# Sinks: incoming, outgoing, broadcast
+
+FIELDS = ("sender", "receiver", "type", "kind")
+SINKS = ("incoming", "outgoing", "broadcast")
+
+WORD_CHAR = r'(?:[^\s(){},"=!-]|-(?!>))'
+TOKEN_REGEX = re.compile(rf'\s*(?:(->|==|!=|[(){{}},])|"([^"]*)"|({WORD_CHAR}+))')
+
+# Used when ROUTING_RULES is empty, same routing reader always had
+DEFAULT_RULES = [
+    "kind == sent and sender in targets -> outgoing",
+    "kind == sent and receiver in targets -> incoming",
+    "kind == received and sender in targets -> incoming",
+    "kind == received and receiver in targets -> outgoing",
+    "kind == found and sender in targets -> incoming, outgoing"
+]
+
+# Used when ROUTING_RULES and TARGET_PLAYERS are both empty
+ALL_PLAYERS_RULES = [
+    "true -> incoming, outgoing"
+]
+
+def tokenize(text):
+    """Splits rule into (kind, value) tokens"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_REGEX.match(text, position)
+        if not match:
+            raise ValueError(f"Unexpected character at {position}: {text[position:]!r}")
+        symbol, quoted, word = match.groups()
+        if symbol:
+            tokens.append(("symbol", symbol))
+        elif quoted is not None:
+            tokens.append(("value", quoted))
+        else:
+            tokens.append(("word", word))
+        position = match.end()
+    return tokens
+
+class RuleParser:
+    """Compiles single rule into predicate closure and sink list"""
+    def __init__(self, text, flag_bits, get_targets):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.flag_bits = flag_bits
+        self.get_targets = get_targets
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ValueError("Unexpected end of rule")
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        token = self.take()
+        if token[1] != value:
+            raise ValueError(f"Expected {value!r}, got {token[1]!r}")
+
+    def parse(self):
+        predicate = self.parse_or()
+        self.expect("->")
+        sinks = [self.parse_sink()]
+        while self.peek()[1] == ",":
+            self.take()
+            sinks.append(self.parse_sink())
+        if self.peek()[0] is not None:
+            raise ValueError(f"Unexpected {self.peek()[1]!r} after sinks")
+        return predicate, tuple(sinks)
+
+    def parse_sink(self):
+        kind, value = self.take()
+        if kind != "word" or value not in SINKS:
+            raise ValueError(f"Unknown sink {value!r}, expected one of: {', '.join(SINKS)}")
+        return value
+
+    def parse_or(self):
+        predicates = [self.parse_and()]
+        while self.peek() == ("word", "or"):
+            self.take()
+            predicates.append(self.parse_and())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda context: any(predicate(context) for predicate in predicates)
+
+    def parse_and(self):
+        predicates = [self.parse_not()]
+        while self.peek() == ("word", "and"):
+            self.take()
+            predicates.append(self.parse_not())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda context: all(predicate(context) for predicate in predicates)
+
+    def parse_not(self):
+        if self.peek() == ("word", "not"):
+            self.take()
+            predicate = self.parse_not()
+            return lambda context: not predicate(context)
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, value = self.take()
+        if value == "(" and kind == "symbol":
+            predicate = self.parse_or()
+            self.expect(")")
+            return predicate
+        if kind != "word":
+            raise ValueError(f"Unexpected {value!r}")
+        if value == "true":
+            return lambda context: True
+        if value.startswith("flags."):
+            bit = self.flag_bits.get(value[len("flags."):])
+            if bit is None:
+                raise ValueError(f"Unknown flag {value!r}, expected one of: {', '.join('flags.' + name for name in self.flag_bits)}")
+            return lambda context: bool(context["flags"] & bit)
+        if value not in FIELDS:
+            raise ValueError(f"Unknown field {value!r}, expected one of: {', '.join(FIELDS)}")
+        return self.parse_comparison(value)
+
+    def parse_comparison(self, field):
+        kind, operator = self.take()
+        if operator == "not":
+            self.expect("in")
+            predicate = self.parse_membership(field)
+            return lambda context: not predicate(context)
+        if operator == "in":
+            return self.parse_membership(field)
+        if operator in ("==", "!="):
+            expected = self.parse_value()
+            if operator == "==":
+                return lambda context: context[field] == expected
+            return lambda context: context[field] != expected
+        raise ValueError(f"Expected comparison after {field!r}, got {operator!r}")
+
+    def parse_membership(self, field):
+        if self.peek() == ("word", "targets"):
+            self.take()
+            if field not in ("sender", "receiver"):
+                raise ValueError(f"Only sender and receiver can be checked against targets, got {field!r}")
+            get_targets = self.get_targets
+            slot_field = f"{field}_slot"
+            # Looked up on every check so target changes apply without recompiling
+            return lambda context: context[slot_field] in get_targets()
+
+        self.expect("{")
+        values = set()
+        if self.peek()[1] != "}":
+            values.add(self.parse_value())
+            while self.peek()[1] == ",":
+                self.take()
+                values.add(self.parse_value())
+        self.expect("}")
+        values = frozenset(values)
+        return lambda context: context[field] in values
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind == "symbol":
+            raise ValueError(f"Expected value, got {value!r}")
+        return value
+
+def compile_rules(rules, flag_bits, get_targets):
+    """Compiles rule strings into list of (predicate, sinks)"""
+    compiled = []
+    for rule in rules:
+        try:
+            compiled.append(RuleParser(rule, flag_bits, get_targets).parse())
+        except ValueError as e:
+            raise ValueError(f"Invalid routing rule {rule!r}: {e}")
+    return compiled
+
+def route(compiled_rules, context):
+    """Returns set of sinks message should go to"""
+    sinks = set()
+    for predicate, rule_sinks in compiled_rules:
+        if predicate(context):
+            sinks.update(rule_sinks)
+    return sinks
@@ -0,0 +1,155 @@
+import zlib
+import bisect
+from array import array
+from collections import OrderedDict
+
+SEPARATOR = "\0"
+
+class ArchiveBlock:
+    """Compressed lines with small index, block is skipped without decompressing when index rules it out"""
+    __slots__ = ("data", "times", "count", "first_time", "last_time", "players")
+
+    def __init__(self, lines, times, players):
+        self.data = zlib.compress(SEPARATOR.join(lines).encode("utf-8"))
+        self.times = zlib.compress(times.tobytes())
+        self.count = len(lines)
+        self.first_time = times[0]
+        self.last_time = times[-1]
+        self.players = frozenset(players)
+
+    def text(self):
+        return zlib.decompress(self.data).decode("utf-8")
+
+    def read(self):
+        """Returns (times, lines)"""
+        times = array("d")
+        times.frombytes(zlib.decompress(self.times))
+        return times, self.text().split(SEPARATOR)
+
+    @property
+    def nbytes(self):
+        return len(self.data) + len(self.times)
+
+class HistoryArchive:
+    """Whole session history, newest lines are kept as strings, older ones in compressed blocks"""
+    def __init__(self, block_size=1000, memory_budget=0, cached_blocks=4):
+        self.block_size = block_size  # Lines per compressed block
+        self.memory_budget = memory_budget  # Compressed bytes kept, oldest blocks are dropped over it. 0 is unlimited
+        self.cached_blocks = cached_blocks  # Decompressed blocks kept for scrolling back and forth
+        self.blocks = []  # Oldest first
+        self.block_times = []  # First time of each block, for bisect
+        self.first_block = 0  # Number of blocks[0], numbers stay the same when old blocks are dropped
+        self.compressed_bytes = 0
+        self.dropped_lines = 0
+        self.hot_lines = []
+        self.hot_times = array("d")
+        self.hot_players = set()
+        self.last_time = 0.0
+        self.cache = OrderedDict()  # Block number -> (times, lines)
+
+    def extend(self, records, when):
+        """Adds (message, event) records, receive time comes from event or defaults to when"""
+        for message, event in records:
+            received = event.get("time", when) if event else when
+            # Times never go back, so they can be searched with bisect
+            if received < self.last_time:
+                received = self.last_time
+            self.last_time = received
+            self.hot_times.append(received)
+            self.hot_lines.append(message)
+            if event:
+                for field in ("sender", "receiver"):
+                    if event.get(field):
+                        self.hot_players.add(event[field])
+            if len(self.hot_lines) >= self.block_size:
+                self.seal()
+
+    def seal(self):
+        """Compresses lines kept as strings into new block"""
+        if not self.hot_lines:
+            return
+        block = ArchiveBlock(self.hot_lines, self.hot_times, self.hot_players)
+        self.blocks.append(block)
+        self.block_times.append(block.first_time)
+        self.compressed_bytes += block.nbytes
+        self.hot_lines = []
+        self.hot_times = array("d")
+        self.hot_players = set()
+
+        while self.memory_budget and self.compressed_bytes > self.memory_budget and len(self.blocks) > 1:
+            dropped = self.blocks.pop(0)
+            del self.block_times[0]
+            self.cache.pop(self.first_block, None)
+            self.first_block += 1
+            self.compressed_bytes -= dropped.nbytes
+            self.dropped_lines += dropped.count
+
+    def __len__(self):
+        return sum(block.count for block in self.blocks) + len(self.hot_lines)
+
+    @property
+    def end_block(self):
+        """Number of block holding lines not compressed yet, one past last compressed block"""
+        return self.first_block + len(self.blocks)
+
+    def get_block(self, number):
+        """Returns (times, lines) of block, decompressing it if it isn't cached"""
+        if number == self.end_block:
+            return array("d", self.hot_times), list(self.hot_lines)
+        if not self.first_block <= number < self.end_block:
+            return array("d"), []
+        block = self.cache.get(number)
+        if block is None:
+            block = self.cache[number] = self.blocks[number - self.first_block].read()
+            while len(self.cache) > self.cached_blocks:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(number)
+        return block
+
+    def get_players(self, number):
+        """Returns players of block without decompressing it"""
+        if number == self.end_block:
+            return self.hot_players
+        return self.blocks[number - self.first_block].players
+
+    def find_time(self, when):
+        """Returns (block number, line position) of first line received at or after when"""
+        if not self.blocks or (self.hot_times and when >= self.hot_times[0]):
+            number = self.end_block
+        else:
+            # Last block starting at or before when, only this block is decompressed
+            number = self.first_block + max(bisect.bisect_right(self.block_times, when) - 1, 0)
+        times, lines = self.get_block(number)
+        position = bisect.bisect_left(times, when)
+        if position == len(times) and number < self.end_block:
+            return number + 1, 0
+        return number, position
+
+    def search(self, text, player=None, limit=500):
+        """Returns up to limit newest (time, line) matches, oldest first.
+        Blocks without player are skipped without decompressing"""
+        text = text.casefold()
+        matches = []
+        for number in range(self.end_block, self.first_block - 1, -1):
+            if player and player not in self.get_players(number):
+                continue
+            if number == self.end_block or number in self.cache:
+                times, lines = self.get_block(number)
+            else:
+                # Whole block is checked at once, lines are split only when it has a match
+                block = self.blocks[number - self.first_block]
+                block_text = block.text()
+                if text not in block_text.casefold() or (player and player not in block_text):
+                    continue
+                times, lines = block.read()
+            found = [(times[position], line) for position, line in enumerate(lines)
+                     if text in line.casefold() and (not player or player in line)]
+            matches[:0] = found
+            if len(matches) >= limit:
+                return matches[-limit:]
+        return matches
+
+    def summary(self):
+        return (f"History: {len(self)} lines, {len(self.blocks)} blocks, "
+                f"{self.compressed_bytes / 1048576:.1f} MB compressed, {self.dropped_lines} dropped")
@@ -0,0 +1,159 @@
+import time
+import tkinter as tk
+from datetime import datetime, timedelta
+from tkinter import Frame, Label, Button, Entry
+
+def parse_time(text, now=None):
+    """Returns timestamp of HH:MM[:SS] (last such moment, today or yesterday) or YYYY-MM-DD HH:MM[:SS]"""
+    now = now or datetime.now()
+    text = text.strip()
+    for pattern in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(text, pattern).timestamp()
+        except ValueError:
+            pass
+    for pattern in ("%H:%M:%S", "%H:%M"):
+        try:
+            parsed = datetime.strptime(text, pattern).time()
+        except ValueError:
+            continue
+        moment = datetime.combine(now.date(), parsed)
+        if moment > now:
+            moment -= timedelta(days=1)
+        return moment.timestamp()
+    raise ValueError(f"Unknown time format: {text}. Use HH:MM or YYYY-MM-DD HH:MM")
+
+def format_lines(times, lines):
+    """Returns lines prefixed with receive time, ready for insert"""
+    return "".join(f"[{time.strftime('%H:%M:%S', time.localtime(received))}] {line}\n"
+                   for received, line in zip(times, lines))
+
+class HistoryView:
+    """Window for browsing compressed history, blocks are decompressed when scrolled or searched into"""
+    def __init__(self, root, archive, bg, fg, widget_bg, font):
+        self.archive = archive
+        self.first_shown = None  # Oldest block in view, None while showing search results
+        self.last_shown = None  # Newest block in view
+
+        self.window = tk.Toplevel(root)
+        self.window.title("History")
+        self.window.geometry("700x500")
+        self.window.configure(bg=bg)
+
+        search_frame = Frame(self.window, bg=bg, padx=10, pady=10)
+        search_frame.pack(fill=tk.X)
+        entry_options = dict(bg=widget_bg, fg=fg, font=font, insertbackground=fg, relief=tk.FLAT, bd=1)
+        button_options = dict(bg=widget_bg, fg=fg, font=font, relief=tk.FLAT, bd=0, padx=10, pady=2)
+
+        Label(search_frame, text="Text:", bg=bg, fg=fg, font=font).pack(side=tk.LEFT)
+        self.text_var = tk.StringVar()
+        text_entry = Entry(search_frame, textvariable=self.text_var, **entry_options)
+        text_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        text_entry.bind("<Return>", lambda e: self.search())
+
+        Label(search_frame, text="Player:", bg=bg, fg=fg, font=font).pack(side=tk.LEFT)
+        self.player_var = tk.StringVar()
+        player_entry = Entry(search_frame, textvariable=self.player_var, width=15, **entry_options)
+        player_entry.pack(side=tk.LEFT, padx=5)
+        player_entry.bind("<Return>", lambda e: self.search())
+
+        Button(search_frame, text="Search", command=self.search, **button_options).pack(side=tk.LEFT, padx=(0, 5))
+        Button(search_frame, text="Latest", command=self.show_latest, **button_options).pack(side=tk.LEFT)
+
+        self.status_label = Label(self.window, text="", bg=bg, fg=fg, font=font, anchor="w", padx=10)
+        self.status_label.pack(fill=tk.X)
+
+        self.text = tk.Text(
+            self.window,
+            wrap=tk.WORD,
+            state=tk.DISABLED,
+            bg=bg,
+            fg=fg,
+            selectbackground="#3D4F5D",
+            font=font,
+            relief=tk.FLAT,
+            highlightthickness=0,
+            bd=0
+        )
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        # Scrolling past the top or bottom loads neighbouring block
+        self.text.bind("<MouseWheel>", lambda e: self.on_scroll_up() if e.delta > 0 else self.on_scroll_down(), add=True)
+        self.text.bind("<Button-4>", lambda e: self.on_scroll_up(), add=True)
+        self.text.bind("<Button-5>", lambda e: self.on_scroll_down(), add=True)
+        self.text.bind("<Prior>", lambda e: self.on_scroll_up(), add=True)
+        self.text.bind("<Next>", lambda e: self.on_scroll_down(), add=True)
+
+        self.show_latest()
+
+    def show_latest(self):
+        """Shows lines not compressed yet and last compressed block"""
+        self.show_blocks(max(self.archive.end_block - 1, self.archive.first_block), self.archive.end_block)
+        self.text.see(tk.END)
+
+    def show_time(self, when):
+        """Shows block with first line received at or after when, that line on top"""
+        number, position = self.archive.find_time(when)
+        self.show_blocks(number, number)
+        self.text.yview(f"{position + 1}.0")
+
+    def show_blocks(self, first, last):
+        self.first_shown = first
+        self.last_shown = last
+        self.set_text("".join(format_lines(*self.archive.get_block(number)) for number in range(first, last + 1)))
+        self.update_status()
+
+    def on_scroll_up(self):
+        if self.first_shown is None or self.first_shown <= self.archive.first_block:
+            return
+        if self.text.yview()[0] > 0.0:
+            return
+
+        self.first_shown -= 1
+        times, lines = self.archive.get_block(self.first_shown)
+        self.text.configure(state=tk.NORMAL)
+        self.text.insert("1.0", format_lines(times, lines))
+        self.text.configure(state=tk.DISABLED)
+        # Keep line that was on top in place
+        self.text.yview(f"{len(lines) + 1}.0")
+        self.update_status()
+
+    def on_scroll_down(self):
+        if self.last_shown is None or self.last_shown >= self.archive.end_block:
+            return
+        if self.text.yview()[1] < 1.0:
+            return
+
+        self.last_shown += 1
+        self.text.configure(state=tk.NORMAL)
+        self.text.insert(tk.END, format_lines(*self.archive.get_block(self.last_shown)))
+        self.text.configure(state=tk.DISABLED)
+        self.update_status()
+
+    def search(self):
+        text = self.text_var.get()
+        player = self.player_var.get().strip() or None
+        if not text and not player:
+            self.show_latest()
+            return
+        self.first_shown = None
+        self.last_shown = None
+        matches = self.archive.search(text, player)
+        self.set_text(format_lines([received for received, line in matches], [line for received, line in matches]))
+        self.text.see(tk.END)
+        self.status_label.config(text=f"{len(matches)} matches. {self.archive.summary()}")
+
+    def set_text(self, text):
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, text)
+        self.text.configure(state=tk.DISABLED)
+
+    def update_status(self):
+        self.status_label.config(text=self.archive.summary())
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
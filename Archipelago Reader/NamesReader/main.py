@@ -1,12 +1,13 @@
-import asyncio
+import argparse
 import sys
-import threading
 import tkinter as tk
 from config_manager import load_config
-from archipelago_client import ArchipelagoClient
 from archipelago_gui import ArchipelagoGUI
 
+# Network stack (asyncio, websockets) is imported on first connect so window shows up sooner
+
 def run_asyncio_loop(client, loop):
+    import asyncio
     asyncio.set_event_loop(loop)
     try:
         loop.run_until_complete(client.connect())
@@ -15,7 +16,48 @@ def run_asyncio_loop(client, loop):
     finally:
         loop.close()
 
+async def run_headless_client(client, stats_interval):
+    """Runs client without GUI and periodically reports traffic"""
+    import asyncio
+    
+    async def report_traffic():
+        while True:
+            await asyncio.sleep(stats_interval)
+            print(f"📊 Traffic: {client.stats.summary()}")
+            print(f"🗂 Name tables: {client.data_package_manager.get_table_stats()}")
+    
+    reporter = asyncio.create_task(report_traffic()) if stats_interval else None
+    try:
+        await client.connect()
+    finally:
+        if reporter:
+            reporter.cancel()
+
+def run_headless():
+    """Prints messages to console without opening window"""
+    import asyncio
+    from archipelago_client import ArchipelagoClient
+    
+    config = load_config()
+    try:
+        client = ArchipelagoClient(config["TARGET_PLAYERS"])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    try:
+        asyncio.run(run_headless_client(client, config["HEADLESS_STATS_INTERVAL"]))
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down...")
+
 def main():
+    parser = argparse.ArgumentParser(description="Archipelago Reader")
+    parser.add_argument("--headless", action="store_true", help="print messages to console without opening window")
+    args = parser.parse_args()
+    
+    if args.headless:
+        run_headless()
+        return
+    
     # Create GUI
     root = tk.Tk()
     gui = ArchipelagoGUI(root)
@@ -28,4 +70,8 @@ def main():
         sys.exit(0)
 
 if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        # Child process of CLIENT_PROCESS starts the same executable
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
\ No newline at end of file
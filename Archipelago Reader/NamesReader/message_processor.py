@@ -1,24 +1,214 @@
 import re
+import sys
+import time
+import fnmatch
+from collections import OrderedDict
 from data_package_manager import DataPackageManager
+from filter_rules import compile_rules, route, DEFAULT_RULES, ALL_PLAYERS_RULES
+
+# Item flags from PrintJSON item parts, filler has no flag so it gets its own bit
+ITEM_CLASS_FLAGS = {
+    "progression": 0b0001,
+    "useful": 0b0010,
+    "trap": 0b0100,
+    "filler": 0b1000
+}
+
+# Resolved item and location names kept for repeated messages
+FRAGMENT_CACHE_SIZE = 4096
+
+# Sections message is shown in, one stored message carries all of them
+PANE_FLAGS = {
+    "incoming": 0b01,
+    "outgoing": 0b10
+}
+
+def receive_time():
+    """Returns receive timestamp in seconds since epoch, history keeps order if system clock goes back"""
+    return time.time()
+
+def get_item_tag(flags):
+    """Returns color tag of item, progression wins over useful and trap like in Archipelago clients"""
+    if flags & ITEM_CLASS_FLAGS["progression"]:
+        return "progression"
+    if flags & ITEM_CLASS_FLAGS["useful"]:
+        return "useful"
+    if flags & ITEM_CLASS_FLAGS["trap"]:
+        return "trap"
+    return "filler"
+
+def get_item_class_mask(item_classes):
+    """Converts list of item class names to bit mask, 0 means no filtering"""
+    mask = 0
+    for item_class in item_classes:
+        mask |= ITEM_CLASS_FLAGS[item_class]
+    return mask
+
+def compile_player_patterns(patterns):
+    """Compiles TARGET_PLAYERS into single regex, entries are names, globs (lewapro*) or regexes (re:lewapro.+)"""
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith("re:"):
+            try:
+                re.compile(pattern[3:])
+            except re.error as e:
+                raise ValueError(f"Invalid player pattern {pattern!r}: {e}")
+            parts.append(f"(?:{pattern[3:]})\\Z")
+        elif any(char in pattern for char in "*?["):
+            # Slot names may contain these characters too, entry still matches itself exactly
+            parts.append(f"{re.escape(pattern)}\\Z|{fnmatch.translate(pattern)}")
+        else:
+            parts.append(f"{re.escape(pattern)}\\Z")
+    return re.compile("|".join(parts)) if parts else None
+
+def get_player_alias(player):
+    """Returns current alias of NetworkPlayer, slot name if it has none"""
+    return player.get("alias") or player.get("name")
+
+def split_lanes(messages):
+    """Splits frame into control messages and PrintJSON feed, keeping order within each"""
+    control = []
+    feed = []
+    for msg in messages:
+        if msg.get("cmd") == "PrintJSON":
+            feed.append(msg)
+        else:
+            control.append(msg)
+    return control, feed
 
 class MessageProcessor:
-    def __init__(self, target_players, data_package_manager, gui=None):
+    def __init__(self, target_players, data_package_manager, gui=None, item_classes=None, routing_rules=None,
+                 fragment_cache_size=FRAGMENT_CACHE_SIZE):
         self.target_players = target_players
+        self.target_pattern = compile_player_patterns(target_players)
+        self.target_slots = set()  # Slots matching TARGET_PLAYERS, resolved when players change
+        self.item_class_mask = get_item_class_mask(item_classes or [])
+        # Compiled once, raises ValueError for invalid rules
+        if not routing_rules:
+            routing_rules = DEFAULT_RULES if target_players else ALL_PLAYERS_RULES
+        self.routing_rules = compile_rules(routing_rules, ITEM_CLASS_FLAGS, lambda: self.target_slots)
+        self.broadcast_routed = any("broadcast" in sinks for _, sinks in self.routing_rules)
         self.data_package_manager = data_package_manager
         self.gui = gui
-        self.players = {}
+        self.players = {}  # Slot -> alias, shown in messages
+        self.slot_names = {}  # Slot -> fixed slot name, renames don't change it
         self.slot_games = {}
         self.player_slots = {}  # Player name to slot mapping
+        self.broadcaster = None  # Optional local broadcast server
+        self.authenticated = False  # Connected was received in current session
+        self.fragment_cache = OrderedDict()  # (kind, game, id) -> resolved name, least recently used first
+        self.fragment_generation = data_package_manager.table_generation  # Tables names in cache were resolved from
+        self.fragment_cache_size = fragment_cache_size
     
     def update_players(self, players_data):
-        """Updates player information"""
+        """Updates player information, players are shown and matched by alias"""
         for player in players_data:
             slot = player.get("slot")
-            name = player.get("name")
+            name = get_player_alias(player)
             self.players[slot] = name
             self.player_slots[name] = slot
+            self.slot_names[slot] = player.get("name", name)
         players_info = f"Players: {self.players}"
         print(players_info)
+        self.resolve_target_slots()
+    
+    def restore_tables(self, players, slot_games):
+        """Restores players and games from session snapshot until server sends current ones"""
+        self.players.update(players)
+        self.player_slots.update({name: slot for slot, name in players.items()})
+        self.slot_games.update(slot_games)
+        self.resolve_target_slots()
+    
+    def apply_players_delta(self, players_data):
+        """Applies player list from RoomUpdate, only touching slots that changed"""
+        changed = False
+        for player in players_data:
+            slot = player.get("slot")
+            # Renames change alias, name stays the fixed slot name
+            name = get_player_alias(player)
+            old_name = self.players.get(slot)
+            self.slot_names[slot] = player.get("name", name)
+            if old_name == name:
+                continue
+            if old_name is None:
+                print(f"👤 Player joined: {name} (slot {slot})")
+            else:
+                print(f"👤 Player renamed: {old_name} -> {name}")
+                if self.player_slots.get(old_name) == slot:
+                    del self.player_slots[old_name]
+            self.players[slot] = name
+            self.player_slots[name] = slot
+            changed = True
+        
+        # Targets only need matching again when names changed
+        if changed:
+            self.resolve_target_slots()
+    
+    def apply_slot_games_delta(self, slot_info):
+        """Applies slot games from RoomUpdate, returns games that weren't known before"""
+        known_games = set(self.slot_games.values())
+        new_games = []
+        for slot_str, info in slot_info.items():
+            slot = int(slot_str)
+            game = info.get("game")
+            if self.slot_games.get(slot) == game:
+                continue
+            print(f"🎮 Slot {slot} game: {game}")
+            self.slot_games[slot] = game
+            if game and game not in known_games:
+                known_games.add(game)
+                new_games.append(game)
+        return new_games
+    
+    def resolve_fragment(self, kind, game_name, fragment_id):
+        """Returns item or location name, unknown IDs are cached too until name tables change"""
+        if self.fragment_generation != self.data_package_manager.table_generation:
+            # Game was loaded or evicted since, unknown IDs may have a name now
+            self.fragment_cache.clear()
+            self.fragment_generation = self.data_package_manager.table_generation
+        key = (kind, game_name, fragment_id)
+        name = self.fragment_cache.get(key)
+        if name is not None:
+            self.fragment_cache.move_to_end(key)
+            return name
+        
+        if kind == "item":
+            name = self.data_package_manager.find_item_name(game_name, fragment_id)
+            if name is None:
+                # If not found in specific game, try any game
+                name = self.data_package_manager.find_item_name_any_game(fragment_id)
+            if name is None:
+                name = f"Item {fragment_id}"
+        else:
+            name = self.data_package_manager.find_location_name(game_name, fragment_id)
+            if name is None:
+                name = self.data_package_manager.find_location_name_any_game(fragment_id)
+            if name is None:
+                name = f"Location {fragment_id}"
+        
+        if self.fragment_cache_size:
+            name = sys.intern(name)
+            self.fragment_cache[key] = name
+            if len(self.fragment_cache) > self.fragment_cache_size:
+                self.fragment_cache.popitem(last=False)
+        return name
+    
+    def get_part_game(self, part, sender_slot, receiver_slot):
+        """Returns game of slot owning item or location part, items belong to receiver and locations to sender"""
+        slot = part.get("player")
+        if slot is None:
+            slot = receiver_slot if part.get("type") == "item_id" else sender_slot
+        return self.slot_games.get(slot, "Unknown") if slot else "Unknown"
+    
+    def resolve_target_slots(self):
+        """Matches TARGET_PLAYERS against known players once, messages only check slot set"""
+        if self.target_pattern is None:
+            return
+        # Targets set by slot name keep matching after player renames themselves
+        self.target_slots = {slot for slot, name in self.players.items()
+                             if self.target_pattern.match(name) or self.target_pattern.match(self.slot_names.get(slot, name))}
+        names = ", ".join(self.players[slot] for slot in sorted(self.target_slots))
+        print(f"🎯 Target players: {names or 'none matched'}")
     
     def update_slot_games(self, slot_info):
         """Updates game information for each slot"""
@@ -32,13 +222,41 @@ class MessageProcessor:
         """Processes incoming message"""
         cmd = msg.get("cmd")
         
-        if cmd == "Connected":
+        if cmd == "RoomInfo":
+            # Remember checksums so only changed games are downloaded
+            self.data_package_manager.update_server_info(
+                msg.get("games", []),
+                msg.get("datapackage_checksums", {})
+            )
+            return False, False
+        
+        elif cmd == "Connected":
             connected_msg = "✅ Successfully authenticated with Archipelago"
             print(connected_msg)
+            self.authenticated = True
+            # Full player list, drop anything left from previous session
+            self.players.clear()
+            self.slot_names.clear()
+            self.player_slots.clear()
+            self.fragment_cache.clear()
             self.update_players(msg.get("players", []))
             self.update_slot_games(msg.get("slot_info", {}))
             return True, False
         
+        elif cmd == "RoomUpdate":
+            # Only changed fields are sent, apply them without reconnecting
+            if "players" in msg:
+                self.apply_players_delta(msg["players"])
+            new_games = self.apply_slot_games_delta(msg.get("slot_info", {}))
+            if new_games or "games" in msg or "datapackage_checksums" in msg:
+                self.data_package_manager.add_server_info(
+                    new_games + msg.get("games", []),
+                    msg.get("datapackage_checksums", {})
+                )
+                # Fetch only missing or changed games, never whole data package here
+                return bool(self.data_package_manager.get_outdated_games()), False
+            return False, False
+        
         elif cmd == "DataPackage":
             data = msg.get("data", {})
             data_package_msg = "✅ Received data package via WebSocket"
@@ -47,6 +265,7 @@ class MessageProcessor:
             keys_info = f"Keys in data package: {list(data.keys())}"
             print(keys_info)
             
+            # New tables change generation, names cached from old ones are dropped on next lookup
             self.data_package_manager.process_data_package(data)
             return False, False
         
@@ -64,18 +283,71 @@ class MessageProcessor:
         
         return False, False
     
+    async def process_control(self, messages, websocket):
+        """Processes control messages (everything but PrintJSON) in order"""
+        request_data_package = False
+        for msg in messages:
+            request, close_connection = await self.process_message(msg, websocket)
+            request_data_package = request_data_package or request
+            if close_connection:
+                return request_data_package, True
+        return request_data_package, False
+    
+    def process_feed(self, messages, received=None):
+        """Resolves PrintJSON messages of frame received at given time and delivers them together"""
+        received = received or receive_time()
+        records = []
+        for msg in messages:
+            record = self.resolve_print_json(msg, received)
+            if record:
+                records.append(record)
+        self.deliver(records)
+    
     async def process_print_json(self, msg):
         """Processes PrintJSON messages"""
+        record = self.resolve_print_json(msg, receive_time())
+        if record:
+            self.deliver([record])
+    
+    def deliver(self, records):
+        """Hands resolved messages to console, local subscribers and GUI at once"""
+        if not records:
+            return
+        
+        print("\n".join(line for line, pane_flags, event, broadcast in records))
+        
+        # Share already resolved messages with local subscribers
+        if self.broadcaster:
+            for line, pane_flags, event, broadcast in records:
+                if broadcast:
+                    self.broadcaster.publish(event)
+        
+        # Single handoff to GUI thread per batch
+        if self.gui:
+            gui_records = [(line, pane_flags, event) for line, pane_flags, event, broadcast in records if pane_flags]
+            if gui_records:
+                self.gui.add_records(gui_records)
+    
+    def resolve_print_json(self, msg, received=None):
+        """Resolves PrintJSON message, returns (line, pane flags, event, broadcast) or None if it's filtered out"""
         try:
             data = msg.get("data", [])
             message_parts = []
             sender_slot = None
             receiver_slot = None
             message_type = None
+            item_flags = 0  # Progression, useful and trap flags of items in message
+            item_classes = 0  # Same as flags, but with filler bit for items without flags
+            has_item = False
             
             # First pass: determine message type and sender/receiver slots
             for i, item in enumerate(data):
-                if item.get("type") == "player_id":
+                if item.get("type") == "item_id":
+                    has_item = True
+                    flags = item.get("flags", 0)
+                    item_flags |= flags
+                    item_classes |= flags or ITEM_CLASS_FLAGS["filler"]
+                elif item.get("type") == "player_id":
                     text = item.get("text", "")
                     if text.isdigit():
                         if sender_slot is None:
@@ -91,135 +363,112 @@ class MessageProcessor:
                     elif "found" in text:
                         message_type = "found"
             
+            # Filter by item class before spending time on resolving names
+            if self.item_class_mask and not item_classes & self.item_class_mask:
+                return
+            
             # For "found" messages set receiver same as sender
             if message_type == "found" and receiver_slot is None:
                 receiver_slot = sender_slot
             
-            # Second pass: process message elements
-            players_in_message = set()  # Set to store players mentioned in message
-            
+            # Second pass: process message elements, remembering where colored parts are
+            spans = []  # (start, end, tag) in message text
+            position = 0
             for item in data:
+                tag = None
                 if item.get("type") == "text":
-                    message_parts.append(item.get("text", ""))
+                    part = item.get("text", "")
                 elif item.get("type") == "player_id":
                     text = item.get("text", "")
                     if text.isdigit():
                         player_slot = int(text)
-                        player_name = self.players.get(player_slot, f"Player {player_slot}")
-                        message_parts.append(player_name)
-                        
-                        # Add player to mentioned players set
-                        players_in_message.add(player_name)
+                        player_name = self.players.get(player_slot)
+                        part = player_name if player_name is not None else f"Player {player_slot}"
                     else:
-                        message_parts.append(text)
+                        part = text
+                    tag = "player"
                 elif item.get("type") == "item_id":
                     text = item.get("text", "")
                     if text.isdigit():
-                        item_id = int(text)
-                        
-                        # Determine game for item based on message type
-                        if message_type == "sent":
-                            # For sent items use sender's game
-                            game_name = self.slot_games.get(sender_slot, "Unknown") if sender_slot else "Unknown"
-                        elif message_type == "received":
-                            # For received items use sender's game
-                            game_name = self.slot_games.get(sender_slot, "Unknown") if sender_slot else "Unknown"
-                        elif message_type == "found":
-                            # For found items use sender's game
-                            game_name = self.slot_games.get(sender_slot, "Unknown") if sender_slot else "Unknown"
-                        else:
-                            # Default to sender's game
-                            game_name = self.slot_games.get(sender_slot, "Unknown") if sender_slot else "Unknown"
-                        
-                        item_name = self.data_package_manager.resolve_item_name(game_name, item_id)
-                        
-                        # If not found in specific game, try any game
-                        if item_name == f"Item {item_id}":
-                            item_name = self.data_package_manager.resolve_item_name_any_game(item_id)
-                        
-                        message_parts.append(item_name)
+                        part = self.resolve_fragment("item", self.get_part_game(item, sender_slot, receiver_slot), int(text))
                     else:
-                        message_parts.append(text)
+                        part = text
+                    tag = get_item_tag(item.get("flags", 0))
                 elif item.get("type") == "location_id":
                     text = item.get("text", "")
                     if text.isdigit():
-                        location_id = int(text)
-                        # For locations use sender's game
-                        game_name = self.slot_games.get(sender_slot, "Unknown") if sender_slot else "Unknown"
-                        location_name = self.data_package_manager.resolve_location_name(game_name, location_id)
-                        if location_name == f"Location {location_id}":
-                            location_name = self.data_package_manager.resolve_location_name_any_game(location_id)
-                        message_parts.append(location_name)
+                        part = self.resolve_fragment("location", self.get_part_game(item, sender_slot, receiver_slot), int(text))
                     else:
-                        message_parts.append(text)
+                        part = text
+                    tag = "location"
                 else:
-                    message_parts.append(item.get("text", ""))
+                    part = item.get("text", "")
+                message_parts.append(part)
+                if tag and part:
+                    spans.append((position, position + len(part), tag))
+                position += len(part)
             
             message_text = "".join(message_parts)
             
             # Determine if message is sent or received
-            is_sent_message = "sent" in message_text.lower()
-            is_received_message = "received" in message_text.lower()
-            is_found_message = "found" in message_text.lower()
+            message_text_lower = message_text.lower()
+            if "sent" in message_text_lower:
+                kind = "sent"
+            elif "received" in message_text_lower:
+                kind = "received"
+            elif "found" in message_text_lower:
+                kind = "found"
+            else:
+                return
+            
+            sender_name = self.players.get(sender_slot) if sender_slot is not None else None
+            receiver_name = self.players.get(receiver_slot) if receiver_slot is not None else None
             
-            # Check if message contains target players or if no target players specified
-            if not self.target_players:
-                # Show all messages if no target players specified
-                target_players_found = True
+            # Routing rules decide where message goes
+            sinks = route(self.routing_rules, {
+                "sender": sender_name,
+                "receiver": receiver_name,
+                "sender_slot": sender_slot,
+                "receiver_slot": receiver_slot,
+                "type": msg.get("type"),
+                "kind": kind,
+                "flags": item_classes
+            })
+            message_types = [pane for pane in ("incoming", "outgoing") if pane in sinks]
+            if self.broadcast_routed:
+                broadcast = "broadcast" in sinks
             else:
-                target_players_found = any(player in players_in_message for player in self.target_players)
+                # Without explicit broadcast rules subscribers get everything shown in GUI
+                broadcast = bool(message_types)
             
-            # Determine message type for GUI
-            message_types = []
+            if not message_types and not broadcast:
+                return
             
-            if target_players_found and (is_sent_message or is_received_message or is_found_message):
-                print(f"📢 {message_text}")
-                
-                # Determine which target player is sender and which is receiver
-                sender_name = None
-                receiver_name = None
-                
-                if sender_slot is not None:
-                    sender_name = self.players.get(sender_slot)
-                
-                if receiver_slot is not None:
-                    receiver_name = self.players.get(receiver_slot)
-                
-                # Determine message type based on target players' roles
-                if is_sent_message:
-                    if sender_name in self.target_players:
-                        message_types.append("outgoing")
-                    if receiver_name in self.target_players and receiver_name is not None:
-                        message_types.append("incoming")
-                    # If sender and receiver are the same player
-                    if sender_name == receiver_name and sender_name in self.target_players:
-                        message_types.append("incoming")
-                        message_types.append("outgoing")
-                
-                elif is_received_message:
-                    if sender_name in self.target_players:
-                        message_types.append("incoming")
-                    if receiver_name in self.target_players and receiver_name is not None:
-                        message_types.append("outgoing")
-                
-                elif is_found_message:
-                    # For found messages always add both types
-                    if sender_name in self.target_players:
-                        message_types.append("incoming")
-                        message_types.append("outgoing")
-                
-                # Remove duplicates
-                message_types = list(set(message_types))
-                
-                # If no target players specified, show in both sections
-                if not self.target_players:
-                    message_types = ["incoming", "outgoing"]
-                
-                # Send message to GUI for each determined type
-                for message_type_gui in message_types:
-                    if self.gui:
-                        self.gui.add_message(f"📢 {message_text}", message_type_gui)
+            # Describe message once for GUI and local subscribers
+            event = {
+                "text": message_text,
+                "panes": message_types,
+                "type": msg.get("type"),
+                "sender": sender_name,
+                "receiver": receiver_name,
+                # Names change with renames, slots don't
+                "sender_slot": sender_slot,
+                "receiver_slot": receiver_slot,
+                "flags": item_flags,
+                "has_item": has_item,
+                # Item is for one of target players
+                "for_target": receiver_slot in self.target_slots,
+                "time": received,
+                "spans": spans
+            }
+            
+            # Stored once, no matter how many sections show it
+            pane_flags = 0
+            for pane in message_types:
+                pane_flags |= PANE_FLAGS[pane]
+            return f"📢 {message_text}", pane_flags, event, broadcast
                     
         except Exception as e:
             error_msg = f"❌ PrintJSON processing error: {e}"
-            print(error_msg)
\ No newline at end of file
+            print(error_msg)
+            return None
\ No newline at end of file
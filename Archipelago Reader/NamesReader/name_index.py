@@ -0,0 +1,104 @@
+import os
+import mmap
+import tempfile
+import struct
+import bisect
+from array import array
+
+# File layout: header, then for items and locations:
+# sorted int64 IDs, uint32 name offsets (count + 1) into UTF-8 blob, blob, padding to 8 bytes
+INDEX_MAGIC = b"APNI"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<4sBxxxIIII")  # magic, version, item count, item blob size, location count, location blob size
+
+def build_table(name_to_id):
+    """Returns (ids, offsets, blob) of one table, sorted by ID"""
+    ids = array("q")
+    offsets = array("I", [0])
+    names = []
+    size = 0
+    for item_id, name in sorted((item_id, name) for name, item_id in name_to_id.items()):
+        encoded = name.encode("utf-8")
+        ids.append(item_id)
+        names.append(encoded)
+        size += len(encoded)
+        offsets.append(size)
+    return ids, offsets, b"".join(names)
+
+def write_name_index(path, item_name_to_id, location_name_to_id):
+    """Writes index file, readers that already opened old one keep their mapping"""
+    items = build_table(item_name_to_id)
+    locations = build_table(location_name_to_id)
+    # Own temp file per writer, readers saving same game at once can't mix their writes
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(items[0]), len(items[2]), len(locations[0]), len(locations[2])))
+            for ids, offsets, blob in (items, locations):
+                # array stores native byte order, index is only shared on the same machine
+                f.write(ids.tobytes())
+                f.write(offsets.tobytes())
+                f.write(blob)
+                # Keep next ID array 8-byte aligned
+                f.write(b"\0" * (-f.tell() % 8))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+class IndexTable:
+    """Read-only ID -> name table backed by mapped file, used like dict"""
+    def __init__(self, view, start, count, blob_size):
+        ids_end = start + count * 8
+        offsets_end = ids_end + (count + 1) * 4
+        self.ids = view[start:ids_end].cast("q")
+        self.offsets = view[ids_end:offsets_end].cast("I")
+        self.blob = view[offsets_end:offsets_end + blob_size]
+        self.end = offsets_end + blob_size
+        self.end += -self.end % 8
+
+    def find(self, item_id):
+        """Returns position of ID or -1"""
+        position = bisect.bisect_left(self.ids, item_id)
+        if position < len(self.ids) and self.ids[position] == item_id:
+            return position
+        return -1
+
+    def get(self, item_id, default=None):
+        position = self.find(item_id)
+        if position < 0:
+            return default
+        return str(self.blob[self.offsets[position]:self.offsets[position + 1]], "utf-8")
+
+    def __contains__(self, item_id):
+        return self.find(item_id) >= 0
+
+    def __getitem__(self, item_id):
+        name = self.get(item_id)
+        if name is None:
+            raise KeyError(item_id)
+        return name
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Mapped bytes used by this table"""
+        return self.ids.nbytes + self.offsets.nbytes + self.blob.nbytes
+
+def open_name_index(path):
+    """Maps index file, returns (items, locations) tables or None if file isn't usable"""
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    magic, version, item_count, item_blob_size, location_count, location_blob_size = HEADER.unpack_from(view)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return None
+    items = IndexTable(view, HEADER.size, item_count, item_blob_size)
+    locations = IndexTable(view, items.end, location_count, location_blob_size)
+    return items, locations
@@ -0,0 +1,76 @@
+from message_processor import ITEM_CLASS_FLAGS
+
+def get_category(event):
+    """Returns category used for shedding and loss accounting"""
+    if not event or not event.get("has_item"):
+        return "other"
+    flags = event.get("flags", 0)
+    if flags & ITEM_CLASS_FLAGS["progression"]:
+        return "progression"
+    if flags & ITEM_CLASS_FLAGS["trap"]:
+        return "trap"
+    if flags & ITEM_CLASS_FLAGS["useful"]:
+        return "useful"
+    return "filler"
+
+class OverloadGuard:
+    """Sheds low priority messages while GUI can't keep up with input rate"""
+    def __init__(self, backlog_threshold, flush_time_threshold, sample_rate, cooldown):
+        self.backlog_threshold = backlog_threshold  # Buffered messages waiting for flush
+        self.flush_time_threshold = flush_time_threshold  # Seconds spent in single flush
+        self.sample_rate = sample_rate  # Keep one of this many useful/trap/other messages
+        self.cooldown = cooldown  # Seconds of calm before leaving overload mode
+        self.active = False
+        self.calm_since = None
+        self.hidden = {}  # Category -> hidden messages since overload started
+        self.seen = {}  # Category -> messages seen in overload, used for sampling
+
+    def update(self, backlog, flush_time, now):
+        """Enters or leaves overload mode based on last flush"""
+        if backlog > self.backlog_threshold or flush_time > self.flush_time_threshold:
+            if not self.active:
+                print(f"⚠️ Overload: {backlog} messages waiting, flush took {flush_time * 1000:.0f}ms")
+                self.active = True
+                self.hidden = {}
+                self.seen = {}
+            self.calm_since = None
+        elif self.active:
+            if self.calm_since is None:
+                self.calm_since = now
+            elif now - self.calm_since >= self.cooldown:
+                print(f"✅ Overload ended, hidden messages: {self.hidden}")
+                self.active = False
+
+    def admit(self, event):
+        """Returns False if message should be hidden"""
+        if not self.active:
+            return True
+
+        category = get_category(event)
+        if category == "progression" or (event and event.get("for_target")):
+            decision = True
+        elif category == "filler":
+            decision = False
+        else:
+            count = self.seen.get(category, 0)
+            self.seen[category] = count + 1
+            decision = count % self.sample_rate == 0
+
+        if not decision:
+            self.hidden[category] = self.hidden.get(category, 0) + 1
+        return decision
+
+    def dismiss(self):
+        """Forgets hidden counts once user has seen them"""
+        if not self.active:
+            self.hidden = {}
+
+    def banner_text(self):
+        """Returns banner text, empty if nothing was hidden"""
+        total = sum(self.hidden.values())
+        if not total:
+            return ""
+        counts = ", ".join(f"{count} {category}" for category, count in sorted(self.hidden.items()))
+        if self.active:
+            return f"⚠ Overloaded, showing important messages only. Hidden: {counts}"
+        return f"⚠ Hidden during overload: {counts} (click to dismiss)"
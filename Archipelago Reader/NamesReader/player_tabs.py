@@ -0,0 +1,163 @@
+import tkinter as tk
+from collections import deque
+from tkinter import Frame, Listbox
+from text_tags import TaggedInsert
+
+class PlayerTab:
+    """Messages of one slot, view is created when tab is opened for the first time"""
+    def __init__(self, slot, name, buffer_size):
+        self.slot = slot
+        self.name = name  # Latest known name of slot, follows renames
+        self.lines = deque(maxlen=buffer_size)  # Ring buffer of (message, event), oldest lines fall out
+        self.total = 0  # Lines ever added
+        self.rendered = 0  # Value of total when view was last updated
+        self.unread = 0
+        self.view = None
+
+    def label(self):
+        return f"{self.name} ({self.unread})" if self.unread else self.name
+
+class PlayerTabs:
+    """Player list with one tab per slot, only open tab is rendered"""
+    def __init__(self, parent, create_view, buffer_size, max_messages, colored, bg, fg, font):
+        self.create_view = create_view  # Called with parent frame, returns Text widget with color tags
+        self.buffer_size = buffer_size
+        self.max_messages = max_messages
+        self.colored = colored
+        self.tabs = {}  # Slot -> PlayerTab
+        self.order = []  # Slots in list order
+        self.active = None
+        self.pending = []  # Messages admitted by GUI, sorted into tabs on flush
+
+        self.frame = Frame(parent, bg=bg)
+        self.player_list = Listbox(
+            self.frame,
+            width=20,
+            exportselection=False,
+            activestyle="none",
+            bg=bg,
+            fg=fg,
+            selectbackground="#3D4F5D",
+            font=font,
+            relief=tk.FLAT,
+            highlightthickness=0,
+            bd=0
+        )
+        self.player_list.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 5))
+        self.player_list.bind("<<ListboxSelect>>", self.on_select)
+        self.view_frame = Frame(self.frame, bg=bg)
+        self.view_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def add(self, records):
+        """Queues (message, event) records for tabs of sender and receiver"""
+        self.pending.extend(records)
+
+    def has_pending(self):
+        return bool(self.pending)
+
+    def flush(self):
+        """Sorts queued messages into tabs and renders open tab only, returns sorted (message, event) records"""
+        count = len(self.pending)
+        batch = self.pending[:count]
+        del self.pending[:count]
+
+        changed = set()
+        for message, event in batch:
+            players = {}  # Slot -> name in this message, sender and receiver may be the same slot
+            if event:
+                for field in ("sender", "receiver"):
+                    slot = event.get(f"{field}_slot")
+                    if slot is not None:
+                        players[slot] = event.get(field)
+            for slot, name in players.items():
+                tab = self.tabs.get(slot)
+                if tab is None:
+                    tab = self.tabs[slot] = PlayerTab(slot, name or f"Player {slot}", self.buffer_size)
+                    self.order.append(slot)
+                    self.player_list.insert(tk.END, tab.name)
+                elif name and name != tab.name:
+                    # Renamed player keeps their tab
+                    tab.name = name
+                    changed.add(slot)
+                tab.lines.append((message, event))
+                tab.total += 1
+                if tab is not self.active:
+                    tab.unread += 1
+                    changed.add(slot)
+
+        for slot in changed:
+            self.update_label(self.tabs[slot])
+
+        if self.active is None and self.order:
+            self.open(self.order[0])
+        elif self.active is not None:
+            self.render(self.active)
+        return batch
+
+    def update_label(self, tab):
+        index = self.order.index(tab.slot)
+        selected = self.player_list.curselection()
+        self.player_list.delete(index)
+        self.player_list.insert(index, tab.label())
+        if index in selected:
+            self.player_list.selection_set(index)
+
+    def on_select(self, event):
+        selection = self.player_list.curselection()
+        if selection:
+            self.open(self.order[selection[0]])
+
+    def open(self, slot):
+        """Shows tab of slot, creating its view if needed"""
+        tab = self.tabs[slot]
+        if tab is self.active:
+            return
+        if self.active is not None:
+            self.active.view.pack_forget()
+
+        self.active = tab
+        if tab.view is None:
+            tab.view = self.create_view(self.view_frame)
+        tab.view.pack(fill=tk.BOTH, expand=True)
+        self.render(tab)
+
+        tab.unread = 0
+        self.update_label(tab)
+        self.player_list.selection_clear(0, tk.END)
+        self.player_list.selection_set(self.order.index(slot))
+
+    def render(self, tab):
+        """Inserts lines view hasn't shown yet"""
+        new_count = tab.total - tab.rendered
+        if not new_count:
+            return
+        tab.rendered = tab.total
+
+        view = tab.view
+        # Keep position if user scrolled up to read older lines
+        follow = view.yview()[1] >= 1.0
+        view.configure(state=tk.NORMAL)
+        if new_count >= len(tab.lines):
+            # More arrived than ring buffer holds, show whole buffer again
+            view.delete(1.0, tk.END)
+            lines = tab.lines
+        else:
+            lines = list(tab.lines)[-new_count:]
+        batch = TaggedInsert(self.colored)
+        for line, event in lines:
+            batch.add_line(line, event)
+        batch.insert(view)
+
+        line_count = int(view.index('end-1c').split('.')[0])
+        if line_count > self.max_messages:
+            view.delete(1.0, f"{line_count - self.max_messages + 1}.0")
+        if follow:
+            view.see(tk.END)
+        view.configure(state=tk.DISABLED)
+
+    def configure_views(self, **options):
+        """Applies new colors and font to list and every created view"""
+        self.player_list.configure(**options)
+        for tab in self.tabs.values():
+            if tab.view is not None:
+                tab.view.configure(**options)
@@ -0,0 +1,81 @@
+import os
+import json
+import zlib
+import struct
+
+# File layout: magic, version, header length, JSON header, then one zlib block per pane
+SNAPSHOT_MAGIC = b"APRS"
+SNAPSHOT_VERSION = 1
+PREFIX = struct.Struct("<4sBI")
+SEPARATOR = "\0"
+
+def save_snapshot(path, players, slot_games, panes, data_package_refs):
+    """Writes session state, panes is dict of pane name -> list of messages"""
+    blocks = []
+    pane_index = {}
+    offset = 0
+    for pane, messages in panes.items():
+        block = zlib.compress(SEPARATOR.join(messages).encode("utf-8"))
+        pane_index[pane] = [offset, len(block), len(messages)]
+        blocks.append(block)
+        offset += len(block)
+
+    header = json.dumps({
+        "players": players,
+        "slot_games": slot_games,
+        "data_package": data_package_refs,
+        "panes": pane_index
+    }).encode("utf-8")
+
+    try:
+        with open(path + ".tmp", "wb") as f:
+            f.write(PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+        os.replace(path + ".tmp", path)
+        return True
+    except Exception as e:
+        print(f"❌ Error saving session snapshot: {e}")
+        return False
+
+class SessionSnapshot:
+    """State of previous session, message blocks are decompressed only when requested"""
+    def __init__(self, path, header, blocks_start):
+        self.path = path
+        self.blocks_start = blocks_start
+        self.players = {int(slot): name for slot, name in header.get("players", {}).items()}
+        self.slot_games = {int(slot): game for slot, game in header.get("slot_games", {}).items()}
+        self.data_package_refs = header.get("data_package", {})
+        self.pane_index = header.get("panes", {})
+
+    @classmethod
+    def load(cls, path):
+        """Reads only header, returns None if there is no usable snapshot"""
+        try:
+            with open(path, "rb") as f:
+                magic, version, header_length = PREFIX.unpack(f.read(PREFIX.size))
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                    return None
+                header = json.loads(f.read(header_length))
+            return cls(path, header, PREFIX.size + header_length)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"❌ Error reading session snapshot: {e}")
+            return None
+
+    def get_messages(self, pane):
+        """Returns saved messages of pane"""
+        if pane not in self.pane_index:
+            return []
+        offset, length, count = self.pane_index[pane]
+        if not count:
+            return []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.blocks_start + offset)
+                return zlib.decompress(f.read(length)).decode("utf-8").split(SEPARATOR)
+        except Exception as e:
+            print(f"❌ Error reading session snapshot: {e}")
+            return []
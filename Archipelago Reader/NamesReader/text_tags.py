@@ -0,0 +1,61 @@
+import tkinter as tk
+
+# Archipelago client colors of message parts
+DEFAULT_MESSAGE_COLORS = {
+    "player": "#EE00EE",
+    "progression": "#AF99EF",
+    "useful": "#6D8BE8",
+    "trap": "#FA8072",
+    "filler": "#00EEEE",
+    "location": "#00FF7F"
+}
+
+def configure_tags(text_widget, colors):
+    """Configures color tags of message parts once, inserted text only references them"""
+    for tag, color in colors.items():
+        text_widget.tag_configure(tag, foreground=color)
+
+class TaggedInsert:
+    """Collects text of one flush as alternating text and tags arguments of single Text.insert call"""
+    def __init__(self, colored=True):
+        self.colored = colored
+        self.args = []
+        self.plain = []  # Untagged text in a row, joined into one argument
+
+    def add(self, text, tags=()):
+        if not text:
+            return
+        if not tags:
+            self.plain.append(text)
+            return
+        if self.plain:
+            self.args += ["".join(self.plain), ()]
+            self.plain = []
+        self.args += [text, tags]
+
+    def add_line(self, line, event):
+        """Adds message line, parts listed in event spans get their color tag"""
+        spans = event.get("spans") if self.colored and event else None
+        if not spans:
+            self.plain.append(line + "\n")
+            return
+        # Spans are positions in event text, line has prefix before it
+        offset = len(line) - len(event["text"])
+        args = self.args
+        plain = self.plain
+        position = 0
+        for start, end, tag in spans:
+            plain.append(line[position:start + offset])
+            args += ["".join(plain), (), line[start + offset:end + offset], (tag,)]
+            plain.clear()
+            position = end + offset
+        plain.append(line[position:] + "\n")
+
+    def insert(self, text_widget):
+        """Inserts everything collected at end of widget"""
+        if self.plain:
+            self.args += ["".join(self.plain), ()]
+            self.plain = []
+        if self.args:
+            text_widget.insert(tk.END, *self.args)
+            self.args = []
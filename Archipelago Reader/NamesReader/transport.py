@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+def get_connect_options(config):
+    """Returns websockets.connect keyword arguments from config"""
+    return {
+        "max_size": config["MAX_MESSAGE_SIZE"],
+        "compression": config["WS_COMPRESSION"],
+        "ping_interval": config["WS_PING_INTERVAL"],
+        "ping_timeout": config["WS_PING_TIMEOUT"],
+        "close_timeout": config["WS_CLOSE_TIMEOUT"],
+        "max_queue": config["WS_MAX_QUEUE"],
+        "write_limit": config["WS_WRITE_LIMIT"]
+    }
+
+def format_bytes(count):
+    """Formats byte count as human readable string"""
+    for unit in ["B", "KB", "MB"]:
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+class TransportStats:
+    """Counts bytes and frames in both directions for current session"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Starts counting for new session"""
+        self.bytes_received = 0  # Message payload after decompression
+        self.frames_received = 0
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.wire_bytes_received = 0  # Raw bytes read from socket (compressed)
+        self.started = time.monotonic()
+        self.last_activity = self.started  # Last time anything arrived from server
+
+    def record_received(self, message):
+        self.last_activity = time.monotonic()
+        self.frames_received += 1
+        self.bytes_received += len(message.encode("utf-8")) if isinstance(message, str) else len(message)
+
+    def record_sent(self, message):
+        self.frames_sent += 1
+        self.bytes_sent += len(message.encode("utf-8")) if isinstance(message, str) else len(message)
+
+    def summary(self):
+        """Returns one line summary for status bar and logs"""
+        text = (f"↓ {format_bytes(self.bytes_received)} / {self.frames_received} frames  "
+                f"↑ {format_bytes(self.bytes_sent)} / {self.frames_sent} frames")
+        if self.wire_bytes_received:
+            text += f"  (wire ↓ {format_bytes(self.wire_bytes_received)})"
+        return text
+
+class MeteredWebSocket:
+    """Wraps websocket connection and counts traffic going through it"""
+    def __init__(self, websocket, stats):
+        self.websocket = websocket
+        self.stats = stats
+        self._hook_wire_counter()
+
+    def _hook_wire_counter(self):
+        """Counts raw socket bytes to see how much compression saves"""
+        data_received = getattr(self.websocket, "data_received", None)
+        if data_received is None:
+            return
+
+        def counting_data_received(data):
+            # Partial frames count as activity too, large data package can take a while
+            self.stats.last_activity = time.monotonic()
+            self.stats.wire_bytes_received += len(data)
+            return data_received(data)
+
+        # Transport looks method up on every read, so instance attribute takes over
+        self.websocket.data_received = counting_data_received
+
+    async def send(self, message):
+        self.stats.record_sent(message)
+        await self.websocket.send(message)
+
+    async def recv(self):
+        message = await self.websocket.recv()
+        self.stats.record_received(message)
+        return message
+
+    async def __aiter__(self):
+        async for message in self.websocket:
+            self.stats.record_received(message)
+            yield message
+
+    async def close(self):
+        await self.websocket.close()
+
+    def __getattr__(self, name):
+        return getattr(self.websocket, name)
+
+class KeepaliveWatchdog:
+    """Detects half-open connections by pinging server when it goes quiet"""
+    def __init__(self, websocket, stats, config):
+        self.websocket = websocket
+        self.stats = stats
+        self.ping_interval = config["WATCHDOG_PING_INTERVAL"]
+        self.pong_timeout = config["WATCHDOG_PONG_TIMEOUT"]
+        self.last_pong = time.monotonic()
+
+    async def run(self):
+        """Returns reason once connection is considered dead, None if it closed normally"""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+
+            # No need to ping while data keeps flowing
+            idle = time.monotonic() - self.stats.last_activity
+            if idle < self.ping_interval:
+                continue
+
+            try:
+                # Sending ping can block too if socket buffer is full
+                await asyncio.wait_for(self.ping(), self.pong_timeout)
+                self.last_pong = time.monotonic()
+            except asyncio.TimeoutError:
+                silence = time.monotonic() - max(self.last_pong, self.stats.last_activity)
+                return f"no response from server for {silence:.0f}s"
+            except Exception:
+                # Connection closed, listen loop handles it
+                return None
+
+    async def ping(self):
+        pong_waiter = await self.websocket.ping()
+        await pong_waiter